@@ -1,9 +1,13 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.subplots as sp
-from geopy.geocoders import Nominatim
+
+from dataviz import narrative
+from dataviz.data import COUNTRY_COLUMNS, imputed_values, load, missing_values, table_index
+from dataviz.export import open_export
+from dataviz.figure_cache import open_cache, plotly_chart_json
+from dataviz.profiling import enabled as profiling_enabled, profile_section, show_sidebar, write_log
+from dataviz.query import Filters, sidebar_filters
+from dataviz.sections import SECTIONS
+from dataviz.table import paginated_table
 
 
 
@@ -26,469 +30,108 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-st.write("<h1 style='text-align: center; color:#3E9DF3; font-size: 80px;'>Dataviz final project</h1>", unsafe_allow_html=True)
-st.write("<h2 style='text-align: center; color:#9A5DFB; font-size: 50px;'>Lucas Artaud & Iswarya Sivasubramaniam DIA 1</h2>", unsafe_allow_html=True)
-st.write('## The GitHub link : https://github.com/Iswarya1011/Dataviz_Project')
+st.write(f"<h1 style='text-align: center; color:#3E9DF3; font-size: 80px;'>{narrative.TITLE}</h1>", unsafe_allow_html=True)
+st.write(f"<h2 style='text-align: center; color:#9A5DFB; font-size: 50px;'>{narrative.AUTHORS}</h2>", unsafe_allow_html=True)
+st.write(f'## The GitHub link : {narrative.GITHUB_URL}')
 
 
 ########## Context and motivation ##########
 
 st.header('Context and motivation', divider='blue')
-st.write('<div class="text-comments"> The data set chosen is a statistical data on factors influencing Life Expectancy. The data comes from the World Health Organization over a 15-year period.', unsafe_allow_html=True)
-st.write('<div class="text-comments">Many studies in the past have explored the factors influencing life expectancy, centering around demographic variables, income composition, and mortality rates. However, these studies often neglected the impact of immunization and the Human Development Index. Additionally, some prior research relied on a one-year dataset for all countries but doing this research for a period of time of 15 year enables us to visualise the changes over time. This data set allows us to do a country based observation to identify the main factors that are contributing to lower life expectancy.', unsafe_allow_html=True)
-st.write('<div class="text-comments">This dataset encompasses health factors for 193 countries from 2000 to 2015, with 22 columns and 2938 rows. Our preliminary analysis indicates that the population, Hepatitis B, and GDP columns contain the majority of missing data. Rather than removing all missing values and losing valuable information, we have opted to retain the incomplete rows.', unsafe_allow_html=True)
-st.write("<div class='text-comments'> The project's motivation is to analyze various factors influencing life expectancy, comparing them on different scales such as continents and development statuses.", unsafe_allow_html=True)
-st.write('<div class="text-comments">The objective is to gain insights into factors affecting life expectancy, guiding public health interventions and policies. Targeted healthcare initiatives could be guided, for instance, by identifying particular regions or demographic groups experiencing challenges with life expectancy. Furthermore, knowledge of how social determinants, economic variables, and immunizations affect life expectancy can support evidence-based decision-making at the national and international levels.', unsafe_allow_html=True)
+for paragraph in narrative.CONTEXT:
+    st.write(f'<div class="text-comments">{paragraph}', unsafe_allow_html=True)
 
-st.write('### The link : https://www.kaggle.com/datasets/kumarajarshi/life-expectancy-who')
+st.write(f'### The link : {narrative.DATASET_URL}')
 
 ########## Columns ##########
 st.header('Columns', divider='blue')
-columns = {
-    "Country": "Country",
-    "Year": "Year",
-    "Status": "Classification of countries as 'developed' or 'developing' based on their gross domestic product(GDP).",
-    "Life expectancy": "Life expectancy (years of age)",
-    "Adult Mortality": "Adult Mortality Rates of both sexes (Probability of dying between 15 and 60 years per 1000 population)",
-    "Infant deaths": "Number of Infant (0-1 year of age) Deaths per 1000 population.",
-    "Alcohol": "Alcohol, recorded per capita (15+) consumption (in litres of pure alcohol).",
-    "Percentage expenditure": "Expenditure on health as a percentage of GPD per capita. (%)",
-    "Hepatitis B": "Hepatitis B immunization coverage among 1-year-olds. (%)",
-    "Measles": "Number of reported cases per 1000 population.",
-    "BMI": "Average Body Mass index of entire population",
-    "Under-five deaths": "Number of under-five deaths per 1000 population",
-    "Polio": "Polio immunization coverage among 1-year-olds (%)",
-    "Total expenditure": "General government expenditure on health as a percentage of total government expenditure (%)",
-    "Diphtheria": "Diphtheria tetanus toxoid and pertussis (DTP3) immunization coverage among 1-year-olds (%)",
-    "HIV/AIDS": "Deaths per 1000 live births HIV/AIDS (0-4 years)",
-    "GDP": "Gross Domestic Product per capita (in USD)",
-    "Population": "Population of the country",
-    "Thinness 1-19 years": "Prevalence of thinness among children and adolescents for Age 10 to 19 (%)",
-    "Thinness 5-9 years": "Prevalence of thinness among children for Age 5 to 9 (%)",
-    "Income composition of resources": "Human Development Index in terms of income composition of resources (index ranging from 0 to 1)",
-    "Schooling": "Number of years of Schooling (years)"
-}
-
-for key, value in columns.items():
+for key, value in narrative.COLUMNS.items():
     st.write(f"<div class='text-comments'><strong>{key}:</strong> {value}</div>", unsafe_allow_html=True)
 
 ########## Dataset Analysis ##########
 st.header('Dataset Analysis', divider='blue')
-df = pd.read_csv("Life Expectancy Data.csv")
+data = load() # memory-mapped snapshot and its aggregate cube, shared read-only by every session
+df = data.df
+dataset_columns = [column for column in df.columns if column not in COUNTRY_COLUMNS] # shown without copying the frame
+figure_cache = open_cache(data.fingerprint) # figure JSON on disk, shared by every worker process
+prebuilt = open_export(data.fingerprint) # figures of an up-to-date static export, if any
 st.write('#### The dataset:')
-df
-st.write('#### The shape:', df.shape)
-st.write('#### The nan values:', df.isna().sum())
+if st.toggle('Show the dataset', key='show_raw_dataset'): # only the visible page is sent, sorted and filtered here
+    paginated_table(table_index(), dataset_columns, key='raw_dataset')
+st.write('#### The shape:', (len(df), len(dataset_columns)))
+st.write('#### The nan values:', missing_values()[dataset_columns])
+# Filled within each country over time, else with the continent's mean of the year (see dataviz/imputation.py)
+st.write('#### The values each chart can impute:', imputed_values())
 
 
 ########## Creation of new columns ##########
 st.header('Creation of new columns', divider='blue')
-st.write('<div class="text-comments">With the library pycountry_convert we are going to create a new column "Continent" that will correspond to the continent of the country. And with Neonatim we are going to generate the latitude and longitude for each country in order to create maps.', unsafe_allow_html=True)
-
-unique_countries = pd.read_csv("countries.csv")
-
-continent_name = {
-    'AF': 'Africa',
-    'AS': 'Asia',
-    'EU': 'Europe',
-    'NA': 'North America',
-    'OC': 'Oceania',
-    'SA': 'South America',
-    'AN': 'Antarctica'
-}
-
-# Replacing the special cases
-df['Country'] = df['Country'].replace({'Bolivia (Plurinational State of)': 'Bolivia', 'Iran (Islamic Republic of)': 'Iran', 'Micronesia (Federated States of)':'Micronesia','Republic of Korea':'Korea, Republic of', 'Korea':"Korea (Democratic People's Republic of)",'The former Yugoslav republic of Macedonia':'North Macedonia','Venezuela (Bolivarian Republic of)':'Venezuela'})
-
-df = pd.merge(df, unique_countries, on='Country', how='left')
-df
-
-########## 1. Average life expectancy and population over the years ##########
-st.header('General Analysis', divider='blue')
-st.subheader('1. Average life expectancy and population over the years', divider='violet')
-
-average_life_expectancy_yearly = df.groupby('Year')['Life expectancy '].mean().reset_index()
-average_population_yearly = df.groupby('Year')['Population'].mean().reset_index()
-
-fig1 = sp.make_subplots(rows=2, cols=1, subplot_titles=['Average Life Expectancy', 'Average Population'])
-
-fig1.add_trace(
-    go.Scatter(x=average_life_expectancy_yearly['Year'], y=average_life_expectancy_yearly['Life expectancy '],
-               mode='lines', name='Life Expectancy'),
-    row=1, col=1
-)
-
-fig1.add_trace(
-    go.Scatter(x=average_population_yearly['Year'], y=average_population_yearly['Population'],
-               mode='lines', name='Population'),
-    row=2, col=1
-)
-
-fig1.update_layout(
-    title_text="Average Life Expectancy and Population Over Time",
-    title_font=dict(size=24),
-    legend=dict(font=dict(size=16)),
-    font=dict(size=15),
-    width=1500,
-    height=800,
-    margin=dict(l=20, r=20, t=60, b=20),
-)
-
-st.plotly_chart(fig1, use_container_width=True)
-st.write("<div class='text-comments'>Between 2000 and 2015, we can see that the average life expectancy has increased from 67 to 72 years. For the average population, it is inconsistent over time. In fact, we can observe ups and downs, especially during 2008 and 2010.", unsafe_allow_html=True)
-
-########## 2. Life Expectancy over the years of the top 5 and bottom 5 countries ##########
-
-st.subheader('2. Life Expectancy over the years of the top 5 and bottom 5 countries', divider='violet')
-
-average_life_expectancy = df.groupby('Country')['Life expectancy '].mean().reset_index() # calculate the average life expectancy
-top5_countries = average_life_expectancy.nlargest(5, 'Life expectancy ') # take the top 5 average life expectancy
-bottom5_countries = average_life_expectancy.nsmallest(5, 'Life expectancy ') # take the bottom 5 average life expectancy
-
-# Filtering the Original DataFrame for the Selected Countries
-selected_countries = top5_countries['Country'].tolist() + bottom5_countries['Country'].tolist()
-filtered_df = df[df['Country'].isin(selected_countries)]
-
-fig2 = px.line(filtered_df, x='Year', y='Life expectancy ', color='Country',title='Life Expectancy over the Years for the top 5 and bottom 5 Countries')
-fig2.update_layout(
-    xaxis_title='Year',
-    yaxis_title='Life Expectancy',
-    title_font=dict(size=24),
-    legend_title='Country',
-    font=dict(size=15),
-    legend=dict(font=dict(size=16)),
-    width=1500,
-    height=800,
-    margin=dict(l=20, r=20, t=60, b=20))
-
-st.plotly_chart(fig2, use_container_width=True)
-st.write('<div class="text-comments">The top 5 countries having the best average on life expectancy over the years are France, Sweden, Iceland, Japan, and Switzerland. The bottom 5 countries having the worst average on life expectancy over the years are Sierra Leone, Malawi, Angola, Central African Republic, and Lesotho. We can notice that the top 5 countries have an increase in life expectancy (from 81-88), but it stabilises from 2009, whereas for the bottom 5, we can see a considerable growth (from 39 to 51 for certain countries). We can also notice that the top 5 countries belong to the northern hemisphere, unlike the bottom 5 that are African countries.', unsafe_allow_html=True)
-
-########## 3. Violin Plot for Life Expectancy by Continent ##########
-
-st.subheader('3. Violin Plot for Life Expectancy by Continent', divider='violet')
-
-fig3 = px.violin(df, x='Continent', y='Life expectancy ', color='Continent', box=True, title='Violin Plot for Life Expectancy by Continent')
-
-fig3.update_layout(
-    xaxis_title='Continent',
-    yaxis_title='Life Expectancy',
-    legend_title='Continent',
-    title_font=dict(size=24),
-    font=dict(size=15),
-    width=1500,
-    height=800,
-    margin=dict(l=20, r=20, t=60, b=20),
-)
-
-st.plotly_chart(fig3, use_container_width=True)
-st.write('<div class="text-comments">We can conclude that Africa is the continent where life expectancy is low, so the authorities should concentrate on this continent. The second continent having a low average is Asia.', unsafe_allow_html=True)
-
-########## 4. Pie chart for the distribution of countries by Status ##########
-
-st.subheader('4. Pie chart repesenting the distribution of Countries by Status', divider='violet')
-
-fig4 = px.pie(
-    df, 
-    names='Status', 
-    title='Distribution of Countries by Development Status',
-    color='Status',  # Assigning colors based on the 'Status' column
-    color_discrete_sequence=['#67001F', '#F4A582'],
-    hole=0.4, 
-)
-
-# Update layout for better readability
-fig4.update_layout(
-    width=1500,
-    height=800,
-    legend_title_text='Development Status',
-    legend=dict(font=dict(size=16)),
-    title_font=dict(size=24),
-    font=dict(size=15),
-)
-
-st.plotly_chart(fig4, use_container_width=True)
-st.write('<div class="text-comments">This dataset contains 17.4% of developed countries and 82.6% of developing countries. This is a notable ratio because, typically, developing countries have lower life expectancy so we can study them in detail.', unsafe_allow_html=True)
-
-########## 5. Comparing the GDP from 2000 to 2015 by the status ##########
-
-st.subheader('5. Comparing the GDP from 2000 to 2015 by status', divider='violet')
-
-df_gdp_avg=df.groupby(['Year', 'Status'])['GDP'].mean().reset_index()
-
-fig5 = px.bar(df_gdp_avg, x='Status', y='GDP', color='Status', title='Average GDP by Country Status over the Years',animation_frame='Year', barmode='group')
-fig5.update_layout(
-    xaxis_title='Year', 
-    yaxis_title='Average GDP (USD)', 
-    font=dict(size=15),
-    title_font=dict(size=24),
-    legend=dict(font=dict(size=16)),
-    width=1500, 
-    height=800,
-    yaxis=dict( range=[0, 35000]))
-
-st.plotly_chart(fig5, use_container_width=True)
-st.write('<div class="text-comments">Over the years, there is a significant gap between the GDP of developed countries and developing countries, taking into account the fact that we have only 17% of developed countries. The gap between GDP and status is considerable. In 2000, we have a gap of 12,842 USD to 20,057 in 2014. There is an increase in GDP on both sides, but the increase is greater for developed countries.', unsafe_allow_html=True)
-
-########## 6. Comparing the life expectancy from 2000 to 2015 by the status ##########
-
-st.subheader('6. Comparing the life expectancy from 2000 to 2015 by status', divider='violet')
-
-fig6 = px.box(df, x='Status', y='Life expectancy ',title='Life Expectancy Distribution by Country Status (2000 to 2015)',animation_frame='Year',category_orders={'Year': sorted(df['Year'].unique())},labels={'Life expectancy': 'Life Expectancy', 'Status': 'Development Status'})
-
-fig6.update_layout(
-    xaxis_title='Development Status',
-    yaxis_title='Life Expectancy',
-    font=dict(size=15),
-    title_font=dict(size=24),
-    legend=dict(font=dict(size=16)),
-    width=1500,
-    height=800,
-    yaxis=dict(range=[35, 90])
-)
-
-st.plotly_chart(fig6, use_container_width=True)
-st.write('<div class="text-comments">We notice an evolution in life expectancy on both sides, but values are more scattered in developing countries compared to the concentrated values in developed countries.', unsafe_allow_html=True)
-
-########## 7. Correlation map in order to study the columns that are influencing the life expectancy ##########
-st.header('Correlation study', divider='blue')
-st.subheader('7. Correlation map in order to study the columns that are influencing the life expectancy', divider='violet')
-
-numeric_columns = df.select_dtypes(include=['float64']).columns # Filtering the non-numeric columns in order to do a correlation
-correlation_matrix = df[numeric_columns].corr()
-
-fig7 = px.imshow(
-    correlation_matrix,
-    color_continuous_scale='GnBu',
-    labels=dict(x='Features', y='Features', color='Correlation'),
-    title='Correlation Heatmap',
-    width=1500,
-    height=800,
-)
-fig7.update_layout(title_font=dict(size=24))
-st.plotly_chart(fig7, use_container_width=True)
-st.write("<div class='text-comments'>From this correlation matrix, we can see that Schooling, Income composition of resources, and BMI are highly correlated to life expectancy. It means that they influence the growth of life expectancy. Let's concentrate on the analysis of these columns.", unsafe_allow_html=True)
-
-########## 8. Correlation between schooling and life expectancy ##########
-
-st.subheader('8. Correlation between schooling and life expectancy', divider='violet')
-
-fig8 = px.scatter(df, x='Schooling', y='Life expectancy ', trendline="ols",title='Scatter Plot of Schooling vs Life Expectancy',labels={'Schooling': 'Years of Schooling', 'Life expectancy ': 'Life Expectancy'})
-
-fig8.update_layout(
-    xaxis_title='Years of Schooling',
-    yaxis_title='Life Expectancy',
-    width=1500,
-    height=800,
-    font=dict(size=15),
-    title_font=dict(size=24),
-    legend=dict(font=dict(size=16))
-)
-
-fig8.update_traces(
-    line=dict(color='red', dash='solid'), 
-    selector=dict(mode='lines')
-)
-
-st.plotly_chart(fig8, use_container_width=True)
-st.write('<div class="text-comments">We can see that we have a clear correlation line between schooling and life expectancy. The more the years of schooling are, the better life expectancy is.', unsafe_allow_html=True)
-
-########## 9. Correlation between income ressources and life expectancy by continent in 2014 ##########
-
-st.subheader('9. Correlation between income ressources and life expectancy by continent in 2014', divider='violet')
-
-df_2014 = df[df['Year'] == 2014]
-
-fig9 = px.scatter(df_2014, x='Income composition of resources', y='Life expectancy ', color='Continent',hover_name='Country', title='Income Composition vs Life Expectancy in 2014',labels={'Income composition of resources': 'Income Composition of Resources', 'Life expectancy': 'Life Expectancy'})
-
-fig9.update_layout(
-    xaxis_title='Income Composition of Resources',
-    yaxis_title='Life Expectancy',
-    width=1500,
-    height=800,
-    font=dict(size=15),
-    title_font=dict(size=24),
-)
-fig9.update_traces(marker=dict(size=8))
-
-st.plotly_chart(fig9, use_container_width=True)
-st.write('<div class="text-comments">Here we are only concentrating on 2014 because 2015 has many missing values, moreover, it enables us to clearly see the correlation. We can note that most countries in Africa have an Income Composition Resources of 0.34-0.59 and a life expectancy of 48-68. For European countries, we have a higher income composition of resources and a better life expectancy. This explains the correlation between both criteria, the more the income composition of resources, the better is the life expectancy.', unsafe_allow_html=True)
-
-########## 10. Average BMI by continent ##########
-st.header('Health study', divider='blue')
-st.subheader('10. Average BMI by continent over the years', divider='violet')
-
-df_avg_bmi = df.groupby(['Continent', 'Year'])[' BMI '].mean().reset_index()
-
-fig10 = px.bar(df_avg_bmi, x='Continent', y=' BMI ', color='Continent',animation_frame='Year',title='Average BMI by Continent over the Years (2000-2015)',labels={' BMI ': 'Average BMI', 'Continent': 'Continent'},range_y=[df_avg_bmi[' BMI '].min(), df_avg_bmi[' BMI '].max()])
-fig10.update_layout(
-    xaxis_title='Continent',
-    yaxis_title='Average BMI',
-    width=1500,
-    height=800,
-    font=dict(size=15),
-    title_font=dict(size=24),
-    legend=dict(font=dict(size=16))
-)
-
-st.plotly_chart(fig10, use_container_width=True)
-st.write('<div class="text-comments">The body mass index (BMI) is a measure that uses your height and weight to work out if your weight is healthy. Compared to the other continents, Africa has the lowest average BMI score. This can explain the fact that it has a lower life expectancy. Indeed, a lower BMI means that they are unhealthy. This can be caused by malnutrition and may provoke earlier death.', unsafe_allow_html=True)
-
-########## 11. Thinness between 1-19 years old accross countries ##########
-
-st.subheader('11. Thinness between 1-19 years old accross countries', divider='violet')
-
-fig11 = px.choropleth(
-    df,
-    locations='Country',
-    locationmode='country names',
-    color=' thinness  1-19 years',
-    hover_name='Country',
-    color_continuous_scale=px.colors.sequential.Plasma,
-    title='Thinness between 1-19 years old accross countries',
-    template='plotly',
-    animation_frame='Year',
-    category_orders={'Year': sorted(df['Year'].unique())}
-)
-fig11.update_geos(
-    resolution=110,
-    showcoastlines=True,
-    coastlinecolor="Black",
-    showland=True,
-    landcolor="white",
-)
-fig11.update_layout(
-    width=1500,  
-    height=800,
-    font=dict(size=15),
-    title_font=dict(size=24),  
-    
-)
-
-st.plotly_chart(fig11, use_container_width=True)
-st.write('<div class="text-comments">In order to analyze our hypothesis made in the last visual, we have created this map representing thinness between 1-19 years old across countries. We can see that South Asian countries (like India, Pakistan) have the highest number of thinness between 1-19 years old. Compared to others, African countries also have a relatively high number of thinness between 1-19 years old, but we can also see that this has improved a little over the years. This can be an explanation for the BMI value.', unsafe_allow_html=True)
-
-########## 12. Violin plot on Alcohol Consumption by continent ##########
-
-st.subheader('12. Violin plot on Alcohol Consumption by continent', divider='violet')
-
-fig12 = px.violin(df, x='Continent', y='Alcohol', color='Continent',box=True,title='Violin plot on Alcohol Consumption by Continent')
- 
-fig12.update_layout(
-    xaxis_title='Continent',
-    yaxis_title='Alcohol consumtion (in Liters)',
-    legend_title='Continent',
-    legend=dict(font=dict(size=16)),
-    font=dict(size=15),
-    title_font=dict(size=24),
-    width=1500,
-    height=800,
-)
-
-st.plotly_chart(fig12, use_container_width=True)
-st.write('<div class="text-comments">Europe is the continent where alcohol consumption is high compared to other continents. We can also see that it is highly spread.', unsafe_allow_html=True)
-
-########## 13. Comparision on the evolution of HIV and Measles ##########
-
-st.subheader('13. Comparision on the evolution of the number of deaths from HIV and Measles', divider='violet')
-
-df_hiv_measles = df.groupby('Year')[[' HIV/AIDS', 'Measles ']].sum().reset_index()
-
-fig13 = sp.make_subplots(rows=2, cols=1, subplot_titles=['HIV/AIDS', 'Measles'])
-
-bar_trace_hiv = go.Bar(x=df_hiv_measles['Year'], y=df_hiv_measles[' HIV/AIDS'], name='HIV/AIDS')
-bar_trace_measles = go.Bar(x=df_hiv_measles['Year'], y=df_hiv_measles['Measles '], name='Measles')
-
-fig13.add_trace(bar_trace_hiv, row=2, col=1)
-fig13.add_trace(bar_trace_measles, row=1, col=1)
-
-fig13.update_layout(
-    title='Number of Deaths by HIV and Measles (2000-2015)',
-    xaxis_title='Year',
-    yaxis_title='Number of Deaths',
-    width=1500,
-    height=800,
-    font=dict(size=15),
-    title_font=dict(size=24),
-    legend=dict(font=dict(size=16))
-)
-fig13.update_xaxes(tickmode='linear')
-fig13.update_xaxes( title_text='Year', row=2, col=1)
-
-fig13.update_yaxes( title_text='Number of Deaths')
-
-st.plotly_chart(fig13, use_container_width=True)
-st.write('<div class="text-comments"> Healthwise, worldwide for this 2 diseases, we can see there is a significant fall in the number of HIV and measles. This decrease can explain the increase in life expectancy worldwide.', unsafe_allow_html=True)
-
-########## 14. Map on the evolution of Adult Mortality ##########
-
-st.subheader('14. Map on the evolution of Adult Mortality', divider='violet')
-
-fig14 = px.choropleth(
-    df,
-    locations='Country',
-    locationmode='country names',
-    color='Adult Mortality',
-    hover_name='Country',
-    color_continuous_scale=px.colors.sequential.Plasma,
-    title='Adult Mortality Across Countries',
-    template='plotly',
-    animation_frame='Year',
-    category_orders={'Year': sorted(df['Year'].unique())}
-)
-fig14.update_geos(
-    resolution=110,
-    showcoastlines=True,
-    coastlinecolor="Black",
-    showland=True,
-    landcolor="white",
-)
-fig14.update_layout(
-    width=1500,  
-    height=800,
-    font=dict(size=15),
-    title_font=dict(size=24),  
-)
-
-st.plotly_chart(fig14, use_container_width=True)
-st.write("<div class='text-comments'>Over the years, African countries and Asian countries have the highest number of adult deaths. This can be explained by health development, malnutrition, and also geopolitical situations (we don't have more information about this third point).", unsafe_allow_html=True)
-
-########## 15. Map on the evolution of under five death to compare ##########
-
-st.subheader('15. Map on the evolution of under five death', divider='violet')
-
-fig15 = px.choropleth(
-    df,
-    locations='Country',
-    locationmode='country names',
-    color='infant deaths',
-    hover_name='Country',
-    color_continuous_scale=px.colors.sequential.Plasma,
-    title='Under five mortality Across Countries',
-    template='plotly',
-    animation_frame='Year',
-    category_orders={'Year': sorted(df['Year'].unique())}
-)
-fig15.update_geos(
-    resolution=110,
-    showcoastlines=True,
-    coastlinecolor="Black",
-    showland=True,
-    landcolor="white",
-)
-fig15.update_layout(
-    width=1500,  
-    height=800,
-    font=dict(size=15),
-    title_font=dict(size=24)
-)
-
-st.plotly_chart(fig15, use_container_width=True)
-st.write('<div class="text-comments">Over the years, India and China, which are the most populated countries in the world, have a high number of under-5-year-old deaths. We have already seen that India also had the highest number of thinness between 1-19. These two elements can be correlated.', unsafe_allow_html=True)
+st.write(f'<div class="text-comments">{narrative.NEW_COLUMNS}', unsafe_allow_html=True)
+
+# The special cases in the country names are replaced and the continent and coordinates merged in dataviz/data.py
+if st.toggle('Show the merged dataset', key='show_merged_dataset'):
+    paginated_table(table_index(), list(df.columns), key='merged_dataset')
+
+########## Sections ##########
+# Each section is only built when its toggle is on. The first one is on by default so the
+# page paints quickly; where Streamlit supports fragments, a section reruns on its own.
+fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
+
+# The sidebar filters select the rows behind every chart (see dataviz/query.py)
+filters = sidebar_filters(df)
+selection = load(filters)
+if filters != Filters():
+    st.sidebar.write(f'{len(selection.df)} of {len(df)} rows selected')
+
+
+# Opt-in with ?profile=1 or DATAVIZ_PROFILE=1: per-section timings in the sidebar and in profile.jsonl
+profiling = profiling_enabled()
+profile_records = []
+
+
+def draw_chart(section):
+    # The imputed Dataset is loaded from the snapshot once per process, like the observed one
+    imputed = st.toggle('Include imputed values', key=f'imputed_{section.number}')
+    dataset = load(filters, imputed=True) if imputed else selection
+    params = section.controls(dataset, key=f'section_{section.number}') if section.controls else {}
+    if params is None: # the controls found nothing to draw and said so
+        return None
+    key = params if filters == Filters() else dict(params, filters=filters._asdict())
+    if imputed:
+        key = dict(key, imputed=True)
+    spec = prebuilt.get(section.number, key) if prebuilt else None
+    if spec is None:
+        spec = figure_cache.get_or_build(section.number, key, lambda: section.build(dataset, **params))
+    plotly_chart_json(spec)
+    return params
+
+
+@fragment
+def render_section(section):
+    if st.toggle('Show the chart', value=section.number == 1, key=f'show_section_{section.number}'):
+        if selection.df.empty:
+            st.info('No rows match the filters in the sidebar.')
+        elif profiling:
+            with profile_section(section.number, profile_records) as record:
+                record['params'] = draw_chart(section)
+        else:
+            draw_chart(section)
+    st.write(f"<div class='text-comments'>{section.comment}</div>", unsafe_allow_html=True)
+
+
+for section in SECTIONS:
+    if section.header:
+        st.header(section.header, divider='blue')
+    st.subheader(section.title, divider='violet')
+    render_section(section)
+
+if profiling:
+    show_sidebar(profile_records)
+    write_log(profile_records)
 
 ########## Conclusion ##########
 st.header('Conclusion', divider='blue')
 
-st.write('<div class="text-comments">In conclusion, this study enabled us to see the evolution of life expectancy in different parts of the world and, more importantly, to identify the main factors influencing it and the continents/countries facing difficulties. Even though overall life expectancy has increased between 2000 and 2015, some parts of the world are less developed than others in certain aspects.', unsafe_allow_html=True)
-st.write('<div class="text-comments">There is a significant gap between developed and developing countries, especially in GDP and life expectancy. Notably, Africa stands out with the lowest average life expectancy, demanding focused attention. To enhance life expectancy, prioritizing investments in education and income generation is imperative.', unsafe_allow_html=True)
-st.write('<div class="text-comments">On the health aspect, we observe significant progress in the reduction of deaths from HIV and measles over the past 15 years. However, challenges persist in African and Asian countries, marked by lower average BMI, high rates of thinness among 1-19-year-olds, and elevated under-5 mortality. Authorities should concentrate on developing African and Asian countries to elevate life expectancy.', unsafe_allow_html=True)
\ No newline at end of file
+for paragraph in narrative.CONCLUSION:
+    st.write(f'<div class="text-comments">{paragraph}', unsafe_allow_html=True)
@@ -0,0 +1,200 @@
+"""Headless benchmark of the dashboard, section by section.
+
+The app is driven with Streamlit's app-testing API (no browser) over the shipped
+CSVs and over synthetically enlarged panels. For each of the 15 sections, the
+script is run with only that section open, and the run's wall time, peak Python
+memory (tracemalloc) and figure payload bytes are recorded. This is done twice:
+
+- cold: empty figure cache and st.cache_data (the dataset itself stays loaded);
+- warm: the same run again, served from the caches.
+
+The first run of each panel size, which imports everything, parses the CSVs and
+builds the snapshot, is reported as the cold start. Each panel size runs in its
+own process so cold starts really are cold.
+
+    python benchmarks/bench_sections.py                    # scales 1, 10, 100, 1000
+    python benchmarks/bench_sections.py --scales 1 10 --output before.json
+    python benchmarks/bench_sections.py --scales 1 10 --compare before.json
+
+An enlarged panel repeats every row `scale` times with the indicators jittered
+by 2%, like subnational rows of the same country and year.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT_DIR, 'Artaud_Sivasubramaniam_DIA1_dataviz.py')
+SECTIONS = range(1, 16)
+DEFAULT_OUTPUT = os.path.join(ROOT_DIR, 'benchmarks', 'results.json')
+
+
+def write_panel(directory, scale):
+    """Write the CSVs of a panel `scale` times the shipped one into `directory`."""
+    import numpy as np
+    import pandas as pd
+
+    shutil.copy(os.path.join(ROOT_DIR, 'countries.csv'), directory)
+    geocode_cache = os.path.join(ROOT_DIR, 'geocode_cache.json')
+    if os.path.exists(geocode_cache):
+        shutil.copy(geocode_cache, directory)
+    source = os.path.join(ROOT_DIR, 'Life Expectancy Data.csv')
+    target = os.path.join(directory, 'Life Expectancy Data.csv')
+    if scale == 1:
+        shutil.copy(source, target)
+        return
+    df = pd.read_csv(source)
+    panel = pd.concat([df] * scale, ignore_index=True)
+    indicators = panel.columns.difference(['Country', 'Year', 'Status'])
+    jitter = np.random.default_rng(0).normal(1, 0.02, (len(panel), len(indicators)))
+    panel[indicators] = panel[indicators] * jitter
+    panel.to_csv(target, index=False)
+
+
+def run_app(at, open_section):
+    """Run the script with only `open_section` open; return (seconds, peak bytes, payload bytes)."""
+    for toggle in at.toggle:
+        if toggle.key and toggle.key.startswith('show_section_'):
+            toggle.set_value(toggle.key == f'show_section_{open_section}')
+    tracemalloc.start()
+    start = time.perf_counter()
+    at.run()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    if at.exception:
+        raise RuntimeError(f'Section {open_section} failed: {at.exception[0].value}')
+    payload = sum(len(chart.proto.figure.spec) for chart in at.get('plotly_chart'))
+    return seconds, peak, payload
+
+
+def clear_caches(figure_cache_dir):
+    import streamlit as st
+
+    st.cache_data.clear()
+    for name in os.listdir(figure_cache_dir):
+        os.remove(os.path.join(figure_cache_dir, name))
+
+
+def measure(scale):
+    """Benchmark one panel size in this process; DATAVIZ_* point at its files."""
+    sys.path.insert(0, ROOT_DIR)
+    from streamlit.testing.v1 import AppTest
+
+    figure_cache_dir = os.environ['DATAVIZ_FIGURE_CACHE_DIR']
+    at = AppTest.from_file(APP, default_timeout=3600)
+
+    start = time.perf_counter()
+    at.run()
+    cold_start = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f'App failed: {at.exception[0].value}')
+    start = time.perf_counter()
+    at.run()
+    warm_start = time.perf_counter() - start
+
+    sections = []
+    for number in SECTIONS:
+        clear_caches(figure_cache_dir)
+        cold = run_app(at, number)
+        warm = run_app(at, number)
+        sections.append({
+            'section': number,
+            'cold': dict(zip(['seconds', 'peak_bytes', 'payload_bytes'], cold)),
+            'warm': dict(zip(['seconds', 'peak_bytes', 'payload_bytes'], warm)),
+        })
+        print(f'  scale {scale:>4}  section {number:>2}  cold {cold[0]:7.3f}s  warm {warm[0]:7.3f}s  '
+              f'{cold[2] / 1024:9.1f} KiB', file=sys.stderr)
+    return {'scale': scale, 'cold_start_seconds': cold_start, 'warm_start_seconds': warm_start,
+            'sections': sections}
+
+
+def run_scale(scale):
+    """Benchmark one panel size in a fresh process."""
+    with tempfile.TemporaryDirectory() as directory:
+        data_dir = os.path.join(directory, 'data')
+        cache_dir = os.path.join(directory, 'figure_cache')
+        os.makedirs(data_dir)
+        os.makedirs(cache_dir)
+        write_panel(data_dir, scale)
+        with open(os.path.join(data_dir, 'Life Expectancy Data.csv')) as file:
+            rows = sum(1 for _ in file) - 1
+        result_path = os.path.join(directory, 'result.json')
+        env = dict(os.environ, DATAVIZ_DATA_DIR=data_dir, DATAVIZ_FIGURE_CACHE_DIR=cache_dir)
+        subprocess.run([sys.executable, __file__, '--worker', str(scale), result_path], env=env, check=True)
+        with open(result_path) as file:
+            return dict(json.load(file), rows=rows)
+
+
+def metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    import pandas
+    import plotly
+    import streamlit
+
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'versions': {'streamlit': streamlit.__version__, 'plotly': plotly.__version__,
+                     'pandas': pandas.__version__},
+    }
+
+
+def compare(results, baseline):
+    """Print the cold/warm time and payload of each section against a previous run."""
+    previous = {(run['scale'], section['section']): section
+                for run in baseline['runs'] for section in run['sections']}
+    print(f"{'scale':>5} {'section':>7} {'cold s':>16} {'warm s':>16} {'payload KiB':>20}")
+    for run in results['runs']:
+        for section in run['sections']:
+            before = previous.get((run['scale'], section['section']))
+            if before is None:
+                continue
+            cells = []
+            for mode, key, unit in (('cold', 'seconds', 1), ('warm', 'seconds', 1), ('cold', 'payload_bytes', 1024)):
+                old, new = before[mode][key] / unit, section[mode][key] / unit
+                ratio = f'{new / old:5.2f}x' if old else '   - '
+                cells.append(f'{new:9.3f} {ratio}')
+            print(f"{run['scale']:>5} {section['section']:>7} " + ' '.join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100, 1000],
+                        help='panel sizes, as multiples of the shipped dataset')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='where to write the JSON results')
+    parser.add_argument('--compare', metavar='RESULTS', help='previous results to compare against')
+    parser.add_argument('--worker', nargs=2, metavar=('SCALE', 'RESULT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        scale, result_path = args.worker
+        with open(result_path, 'w') as file:
+            json.dump(measure(int(scale)), file)
+        return
+
+    results = {'meta': metadata(), 'runs': [run_scale(scale) for scale in args.scales]}
+    with open(args.output, 'w') as file:
+        json.dump(results, file, indent=1)
+    print(f'Wrote {args.output}')
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, json.load(file))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Resident memory of one server process as concurrent sessions are added.
+
+Each session is a headless app-testing session (streamlit.testing.v1.AppTest)
+that stays alive, as a connected browser tab would. Sessions share the
+process-wide resources (dataset, cube, correlation statistics, figure cache),
+so resident memory should stay flat as sessions are added. What does grow is
+each session's own state: its widgets and the elements it was sent.
+
+    python benchmarks/memory_report.py --sessions 1 10 25 50 100 --open 1 7 9
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT_DIR, 'Artaud_Sivasubramaniam_DIA1_dataviz.py')
+
+
+def resident_bytes():
+    """Current resident set size of this process, or None where it cannot be read.
+
+    Uses psutil when it is installed (any platform), else /proc (Linux).
+    """
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/status') as file:
+            for line in file:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def open_session(open_sections):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=600)
+    at.run()
+    if open_sections:
+        for number in open_sections:
+            at.toggle(key=f'show_section_{number}').set_value(True)
+        at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return at
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 10, 25, 50, 100],
+                        help='numbers of concurrent sessions to report')
+    parser.add_argument('--open', type=int, nargs='*', default=[], metavar='SECTION',
+                        help='sections each session opens besides section 1')
+    parser.add_argument('--output', help='also write the report as JSON')
+    args = parser.parse_args()
+    sys.path.insert(0, ROOT_DIR)
+
+    sessions = []
+    report = []
+    baseline = resident_bytes()
+    print(f"{'sessions':>8} {'RSS MiB':>9} {'per session KiB':>16} {'seconds':>8}")
+    for target in sorted(args.sessions):
+        start = time.perf_counter()
+        while len(sessions) < target:
+            sessions.append(open_session(args.open))
+        gc.collect()
+        rss = resident_bytes()
+        if not report:
+            first = rss
+        per_session = None
+        if rss is not None:
+            per_session = (rss - first) / (target - 1) if target > 1 else 0
+        row = {'sessions': target, 'rss_bytes': rss, 'growth_per_session_bytes': per_session,
+               'seconds': time.perf_counter() - start}
+        report.append(row)
+        if rss is None: # neither psutil nor /proc: only the timings
+            print(f'{target:>8} {"-":>9} {"-":>16} {row["seconds"]:>8.2f}')
+        else:
+            print(f'{target:>8} {rss / 2 ** 20:>9.1f} {per_session / 1024:>16.1f} {row["seconds"]:>8.2f}')
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'baseline_rss_bytes': baseline, 'open_sections': args.open, 'report': report}, file, indent=1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Cold start of a fresh worker process, with the imports it pays for.
+
+Each run is a new interpreter started with `python -X importtime` that loads
+Streamlit and runs the app once headless (streamlit.testing.v1.AppTest), like
+a worker serving its first page. Two runs share a temporary figure cache:
+
+- cold: the cache is empty, so the open sections build their figures;
+- warm: the figures are served from the cache, as for every worker after the
+  first one.
+
+The report splits the import time between what is loaded before the script runs
+(Streamlit and its dependencies, paid by any app) and what the script's own run
+imports, and lists the slowest of the latter.
+
+    python benchmarks/startup_report.py
+    python benchmarks/startup_report.py --top 30 --open 8 11 --output startup.json
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT_DIR, 'Artaud_Sivasubramaniam_DIA1_dataviz.py')
+# Modules the app should only import when a section needs them
+WATCHED = ['plotly.express', 'geopy', 'statsmodels', 'scipy', 'pycountry']
+MARKER = 'startup_report: script run starts'
+
+DRIVER = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=600)
+print({marker!r}, file=sys.stderr, flush=True)
+before_run = time.perf_counter()
+at.run()
+for number in {open_sections!r}:
+    at.toggle(key=f'show_section_{{number}}').set_value(True)
+if {open_sections!r}:
+    at.run()
+done = time.perf_counter()
+print(json.dumps({{'seconds': done - start, 'run_seconds': done - before_run,
+                  'exception': [str(exception.value) for exception in at.exception]}}))
+"""
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_importtime(stderr):
+    """(before, during): lists of (module, self_us, cumulative_us, depth) around the marker."""
+    before, during = [], []
+    current = before
+    for line in stderr.splitlines():
+        if line.startswith(MARKER):
+            current = during
+            continue
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            current.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return before, during
+
+
+def run(label, cache_dir, open_sections, top):
+    env = dict(os.environ, DATAVIZ_FIGURE_CACHE_DIR=cache_dir,
+               DATAVIZ_EXPORT_DIR=os.path.join(cache_dir, 'no-export'))
+    driver = DRIVER.format(root=ROOT_DIR, app=APP, marker=MARKER, open_sections=list(open_sections))
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', driver], env=env,
+                             capture_output=True, text=True, check=True)
+    result = json.loads(process.stdout.strip().splitlines()[-1])
+    if result['exception']:
+        raise RuntimeError(f'App failed: {result["exception"][0]}')
+    before, during = parse_importtime(process.stderr)
+    imported = {module for module, _, _, _ in before + during}
+    report = {
+        'label': label,
+        'seconds': result['seconds'],
+        'run_seconds': result['run_seconds'],
+        # Self times add up without counting nested imports twice
+        'import_seconds_before_run': sum(item[1] for item in before) / 1e6,
+        'import_seconds_during_run': sum(item[1] for item in during) / 1e6,
+        'slowest_during_run': [{'module': module, 'cumulative_ms': cumulative / 1000}
+                               for module, _, cumulative, depth in
+                               sorted(during, key=lambda item: -item[2]) if depth == 0][:top],
+        'watched': {module: any(name == module or name.startswith(f'{module}.') for name in imported)
+                    for module in WATCHED},
+    }
+
+    print(f"{label}: {report['seconds']:.2f}s to the first page "
+          f"(script run {report['run_seconds']:.2f}s); imports {report['import_seconds_before_run']:.2f}s "
+          f"before the run, {report['import_seconds_during_run']:.2f}s during it")
+    for row in report['slowest_during_run']:
+        print(f"  {row['cumulative_ms']:9.1f} ms  {row['module']}")
+    print('  imported: ' + ', '.join(f"{module} {'yes' if seen else 'no'}"
+                                      for module, seen in report['watched'].items()))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--top', type=int, default=15, help='slowest imports of the script run to list')
+    parser.add_argument('--open', type=int, nargs='*', default=[], metavar='SECTION',
+                        help='sections to open besides section 1')
+    parser.add_argument('--output', help='also write the report as JSON')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        reports = [run(label, cache_dir, args.open, args.top) for label in ('cold', 'warm')]
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(reports, file, indent=1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+"""Helpers behind the life expectancy Streamlit dashboard."""
+import os
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Directory of the CSVs and their snapshot; overridden e.g. by the benchmarks
+DATA_DIR = os.environ.get('DATAVIZ_DATA_DIR', ROOT_DIR)
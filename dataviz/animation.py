@@ -0,0 +1,55 @@
+"""Animation controls and bars shared by the hand-built animated figures."""
+import plotly.graph_objects as go
+
+
+def animation_controls(frame_names, prefix='Year=', redraw=True):
+    """Frame slider and play/pause buttons, laid out as plotly express does."""
+    def animate(frames, duration, redraw=redraw, **options):
+        return [frames, dict(frame=dict(duration=duration, redraw=redraw), mode='immediate',
+                             transition=dict(duration=0), **options)]
+
+    slider = dict(
+        active=0,
+        currentvalue=dict(prefix=prefix),
+        pad=dict(b=10, t=60),
+        len=0.9, x=0.1, y=0,
+        steps=[dict(label=str(name), method='animate', args=animate([str(name)], 0)) for name in frame_names],
+    )
+    buttons = dict(
+        type='buttons', direction='left', showactive=False,
+        pad=dict(r=10, t=70), x=0.1, xanchor='right', y=0, yanchor='top',
+        buttons=[
+            dict(label='&#9654;', method='animate', args=animate(None, 500, fromcurrent=True)),
+            dict(label='&#9724;', method='animate', args=animate([None], 0, redraw=False)),
+        ],
+    )
+    return [slider], [buttons]
+
+
+def animated_bars(df, category, value, frame='Year', labels=None):
+    """One bar per `category`, animated over `frame`, as px.bar(color=category, animation_frame=frame) draws it.
+
+    px.bar builds a figure per frame and merges them; here the bars are built
+    once and each frame only carries its values.
+    """
+    labels = labels or {}
+    category_label, value_label = labels.get(category, category), labels.get(value, value)
+    table = df.pivot(index=frame, columns=category, values=value)
+    names = list(table.columns)
+
+    def bars(frame_value):
+        hover = f'{category_label}=%{{x}}<br>{frame}={frame_value}<br>{value_label}=%{{y}}<extra></extra>'
+        return [go.Bar(x=[name], y=[table.at[frame_value, name]], hovertemplate=hover) for name in names]
+
+    fig = go.Figure(bars(table.index[0]))
+    # Named once in the base traces; the frames only change the values and hover text
+    for trace, name in zip(fig.data, names):
+        trace.update(name=name, legendgroup=name, offsetgroup=name)
+    fig.frames = [go.Frame(name=str(frame_value), data=bars(frame_value), traces=list(range(len(names))))
+                  for frame_value in table.index]
+    sliders, updatemenus = animation_controls(list(table.index), prefix=f'{frame}=')
+    # barmode and legend gap are the px.bar defaults
+    fig.update_layout(sliders=sliders, updatemenus=updatemenus, barmode='relative',
+                      legend=dict(title_text=category_label, tracegroupgap=0),
+                      xaxis_title=category_label, yaxis_title=value_label)
+    return fig
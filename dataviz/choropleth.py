@@ -0,0 +1,73 @@
+"""Shared builder for the world maps (sections 11, 14 and 15).
+
+Countries are located by the ISO-3 codes resolved when the dataset is prepared,
+so the browser never matches country names against its geometry. The base trace
+carries the country codes and names once. Each animation frame only carries
+that year's values, in the same country order. With `year` set, a single
+static map of that year is built and no other year is sent.
+"""
+import plotly.graph_objects as go
+from plotly.colors import sequential
+
+from dataviz.animation import animation_controls
+from dataviz.profiling import data_prep
+
+
+@data_prep
+def _values_by_year(df, column):
+    """Country x Year table of `column`; countries that never have a value are left out."""
+    return df.pivot_table(index=['ISO3', 'Country'], columns='Year', values=column,
+                          aggfunc='mean', observed=True)
+
+
+def _z(values, year):
+    # NaN becomes null in the figure JSON: the country is drawn without a value
+    return values[year].round(2).to_numpy() if year in values else [None] * len(values)
+
+
+def build_choropleth(df, column, title, year=None):
+    """World map of `column`, animated over the years or for a single `year`."""
+    values = _values_by_year(df, column)
+    years = sorted(df['Year'].unique())
+    first_year = years[0] if year is None else year
+
+    fig = go.Figure(go.Choropleth(
+        locations=values.index.get_level_values('ISO3'),
+        locationmode='ISO-3',
+        z=_z(values, first_year),
+        text=values.index.get_level_values('Country'),
+        hovertemplate=f'<b>%{{text}}</b><br>{column}=%{{z}}<extra></extra>',
+        coloraxis='coloraxis',
+    ))
+    # The same color range for every year, so the frames are comparable
+    fig.update_layout(coloraxis=dict(
+        colorscale=sequential.Plasma,
+        cmin=values.min().min(), cmax=values.max().max(),
+        colorbar=dict(title=column),
+    ))
+
+    if year is None:
+        fig.frames = [go.Frame(name=str(frame_year), data=[go.Choropleth(z=_z(values, frame_year))], traces=[0])
+                      for frame_year in years]
+        sliders, updatemenus = animation_controls(years)
+        fig.update_layout(sliders=sliders, updatemenus=updatemenus)
+        title_text = title
+    else:
+        title_text = f'{title} ({year})'
+
+    fig.update_geos(
+        resolution=110,
+        showcoastlines=True,
+        coastlinecolor="Black",
+        showland=True,
+        landcolor="white",
+    )
+    fig.update_layout(
+        title=title_text,
+        template='plotly',
+        width=1500,
+        height=800,
+        font=dict(size=15),
+        title_font=dict(size=24),
+    )
+    return fig
@@ -0,0 +1,76 @@
+"""Correlation matrices of any Year/Status/Continent selection.
+
+For every Year x Status x Continent group the stats hold, for each pair of
+columns (i, j) over the rows where both are present: the count, the sum and sum
+of squares of column i, and the sum of cross-products. These are additive, so
+the pairwise-complete correlation of any combination of groups (what
+DataFrame.corr computes) comes from summing a few k x k arrays instead of
+rescanning rows.
+"""
+import warnings
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from dataviz.profiling import data_prep
+
+GROUP_KEYS = ['Year', 'Status', 'Continent']
+
+# `groups` has one row of keys per group; the arrays are indexed (group, i, j)
+CorrelationStats = namedtuple('CorrelationStats', ['columns', 'groups', 'n', 'sx', 'sxx', 'sxy'])
+
+
+def build_correlation_stats(df, columns):
+    """Pairwise sufficient statistics of `columns`, per group of GROUP_KEYS."""
+    columns = list(columns)
+    values = df[columns].to_numpy(dtype=np.float64)
+    present = ~np.isnan(values)
+    # Correlation does not depend on a shift; centering keeps the sums well conditioned
+    with warnings.catch_warnings(): # a column without values, e.g. in a selection of a few countries
+        warnings.simplefilter('ignore', RuntimeWarning)
+        means = np.nanmean(values, axis=0)
+    centered = np.where(present, values - means, 0)
+    present = present.astype(np.float64)
+
+    grouped = df.groupby(GROUP_KEYS, observed=True, dropna=False, sort=True)
+    codes = grouped.ngroup().to_numpy()
+    groups = grouped.size().index.to_frame(index=False)[GROUP_KEYS]
+    k = len(columns)
+    n, sx, sxx, sxy = (np.zeros((len(groups), k, k)) for _ in range(4))
+
+    # Rows sorted by group, so each group is a contiguous block
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(groups) + 1))
+    for group, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+        rows = order[start:stop]
+        x, m = centered[rows], present[rows]
+        n[group] = m.T @ m
+        sx[group] = x.T @ m
+        sxx[group] = (x * x).T @ m
+        sxy[group] = x.T @ x
+    return CorrelationStats(columns, groups, n, sx, sxx, sxy)
+
+
+def group_mask(stats, years=None, statuses=None, continents=None):
+    """Boolean mask of the groups matching the filters; None means no filter."""
+    mask = np.ones(len(stats.groups), dtype=bool)
+    for key, selected in zip(GROUP_KEYS, (years, statuses, continents)):
+        if selected is not None:
+            mask &= stats.groups[key].isin(selected).to_numpy()
+    return mask
+
+
+@data_prep
+def correlation_matrix(stats, years=None, statuses=None, continents=None):
+    """Pairwise Pearson correlation over the selected groups, like DataFrame.corr()."""
+    mask = group_mask(stats, years, statuses, continents)
+    n, sx, sxx, sxy = (array[mask].sum(axis=0) for array in (stats.n, stats.sx, stats.sxx, stats.sxy))
+    # sx[i, j] sums column i and sx[j, i] column j, over the rows where both are present
+    covariance = n * sxy - sx * sx.T
+    variance = n * sxx - sx ** 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = covariance / np.sqrt(variance * variance.T)
+    corr[(n < 2) | (variance <= 0) | (variance.T <= 0)] = np.nan
+    corr = np.clip(corr, -1, 1)
+    return pd.DataFrame(corr, index=stats.columns, columns=stats.columns)
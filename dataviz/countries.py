@@ -0,0 +1,339 @@
+"""Country metadata of the dataset: ISO-3 code, continent and coordinates.
+
+Resolution is offline and runs once per distinct name, when the snapshot is
+built (see dataviz/data.py):
+
+- names are normalized in bulk (accents, case, punctuation) and looked up in a
+  hash index of aliases, ISO codes and the names pycountry knows, giving an
+  ISO-3 code;
+- the continent comes from countries.csv, else from CONTINENT_OVERRIDES, and
+  the coordinates from the geocode cache (geocode_cache.json), else from
+  countries.csv. Coordinates outside the country's continent, or shared by
+  several countries, are dropped;
+- the rows are then enriched through their category codes, in O(rows).
+
+The geocode cache is filled by a batch refresh, rate-limited and concurrent,
+against Nominatim or a local stand-in geocoder. Nothing reaches the network
+otherwise.
+
+    python -m dataviz.countries                       # unresolved names and suspect coordinates
+    python -m dataviz.countries --refresh --user-agent life-expectancy-dashboard
+    python -m dataviz.countries --refresh --stand-in coordinates.csv
+"""
+import argparse
+import concurrent.futures
+import datetime
+import functools
+import json
+import os
+import threading
+import time
+import warnings
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from dataviz import DATA_DIR
+
+COUNTRIES_CSV = os.path.join(DATA_DIR, 'countries.csv')
+GEOCODE_CACHE = os.path.join(DATA_DIR, 'geocode_cache.json')
+
+# Special cases where the WHO name differs from the one in countries.csv
+COUNTRY_ALIASES = {
+    'Bolivia (Plurinational State of)': 'Bolivia',
+    'Iran (Islamic Republic of)': 'Iran',
+    'Micronesia (Federated States of)': 'Micronesia',
+    'Republic of Korea': 'Korea, Republic of',
+    'Korea': "Korea (Democratic People's Republic of)",
+    'The former Yugoslav republic of Macedonia': 'North Macedonia',
+    'Venezuela (Bolivarian Republic of)': 'Venezuela',
+}
+
+# Names pycountry does not resolve by itself
+ISO3_OVERRIDES = {
+    'Democratic Republic of the Congo': 'COD',
+    "Korea (Democratic People's Republic of)": 'PRK',
+    'Micronesia': 'FSM',
+    'Swaziland': 'SWZ',
+    'Turkey': 'TUR',
+}
+
+# Continents countries.csv lacks, by ISO-3 code
+CONTINENT_OVERRIDES = {
+    'TLS': 'Asia',
+}
+
+# (south, north, west, east) boxes a country's coordinates must fall in; generous,
+# they catch a geocode of a namesake place abroad (Albania in Colombia), not borders
+CONTINENT_BOUNDS = {
+    'Africa': [(-47, 38, -26, 64)],
+    'Asia': [(-11, 82, 25, 180)],
+    'Europe': [(34, 82, -32, 180)],
+    'North America': [(5, 84, -180, -52)],
+    'Oceania': [(-50, 23, 110, 180), (-50, 23, -180, -120)],
+    'South America': [(-56, 13, -82, -34)],
+}
+
+COLUMNS = ['Continent', 'latitude', 'longitude', 'ISO3']
+
+Location = namedtuple('Location', ['address', 'latitude', 'longitude'])
+
+
+def normalize_names(names):
+    """"Côte d'Ivoire" -> 'cote divoire', for a whole array of names at once."""
+    return (pd.Series(names, dtype=object).astype(str)
+            .str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii')
+            .str.casefold()
+            .str.replace(r"['’]", '', regex=True)
+            .str.replace(r'[^a-z0-9]+', ' ', regex=True)
+            .str.strip()
+            .str.replace(r'^the ', '', regex=True)
+            .to_numpy())
+
+
+@functools.lru_cache(maxsize=1)
+def alias_index():
+    """Normalized name or ISO code -> ISO-3 code, as a Series indexed by a hash index."""
+    import pycountry
+
+    keys, codes = list(ISO3_OVERRIDES), list(ISO3_OVERRIDES.values())
+    with warnings.catch_warnings():
+        # pycountry warns and falls back to the name for countries without the attribute
+        warnings.simplefilter('ignore', UserWarning)
+        for country in pycountry.countries:
+            for attribute in ('alpha_3', 'alpha_2', 'name', 'official_name', 'common_name'):
+                keys.append(getattr(country, attribute))
+                codes.append(country.alpha_3)
+    index = pd.Series(codes, index=normalize_names(keys))
+    index = index[~index.index.duplicated()] # the overrides come first and win
+    aliases = pd.Series(index.reindex(normalize_names(list(COUNTRY_ALIASES.values()))).to_numpy(),
+                        index=normalize_names(list(COUNTRY_ALIASES)))
+    index = pd.concat([aliases.dropna(), index])
+    return index[~index.index.duplicated()]
+
+
+def iso3_codes(names):
+    """ISO 3166-1 alpha-3 code of each name, None where it is unknown."""
+    codes = alias_index().reindex(normalize_names(names)).to_numpy()
+    return np.where(pd.isna(codes), None, codes)
+
+
+def read_geocode_cache(path=GEOCODE_CACHE):
+    """ISO-3 code -> cached geocode ({'query', 'latitude', 'longitude', ...})."""
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def write_geocode_cache(cache, path=GEOCODE_CACHE):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(cache, file, indent=1, sort_keys=True, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def in_continent(continents, latitudes, longitudes):
+    """Whether each coordinate falls within its continent; False when either is missing."""
+    continents = np.asarray(continents, dtype=object)
+    latitudes, longitudes = np.asarray(latitudes, dtype=float), np.asarray(longitudes, dtype=float)
+    inside = np.zeros(len(continents), dtype=bool)
+    for continent, boxes in CONTINENT_BOUNDS.items():
+        rows = continents == continent
+        for south, north, west, east in boxes:
+            inside |= rows & (latitudes >= south) & (latitudes <= north) & (longitudes >= west) & (longitudes <= east)
+    return inside
+
+
+def resolve(names, reference, cache=None):
+    """Metadata of each distinct name, with the issues found resolving it.
+
+    `reference` is countries.csv (Country, Continent, latitude, longitude) and
+    `cache` the geocode cache. Returns a frame indexed by name with the Country
+    the rows are renamed to, COLUMNS, the source of the coordinates and issue,
+    an empty string when the name resolved cleanly.
+    """
+    cache = read_geocode_cache() if cache is None else cache
+    names = pd.Index(names)
+    iso3 = iso3_codes(names)
+    # countries.csv is matched on the ISO-3 code, or on the name for places without one
+    reference_iso3 = iso3_codes(reference['Country'])
+    reference_keys = pd.Index(np.where(pd.isna(reference_iso3),
+                                       'name:' + normalize_names(reference['Country']), reference_iso3))
+    keys = np.where(pd.isna(iso3), 'name:' + normalize_names(names), iso3)
+    position = reference_keys.get_indexer(keys)
+    matched = position >= 0
+    row = reference.iloc[np.where(matched, position, 0)]
+
+    result = pd.DataFrame({
+        'Country': np.where(matched, row['Country'].to_numpy(), names.to_numpy()),
+        'Continent': np.where(matched, row['Continent'].to_numpy(), None),
+        'latitude': np.where(matched, row['latitude'].to_numpy(), np.nan).astype(float),
+        'longitude': np.where(matched, row['longitude'].to_numpy(), np.nan).astype(float),
+        'ISO3': iso3,
+        'source': np.where(matched, os.path.basename(COUNTRIES_CSV), ''),
+    }, index=names)
+    cached = result['ISO3'].map(lambda code: cache.get(code) if code else None)
+    hits = cached.notna().to_numpy()
+    result.loc[hits, 'latitude'] = [entry['latitude'] for entry in cached[hits]]
+    result.loc[hits, 'longitude'] = [entry['longitude'] for entry in cached[hits]]
+    result.loc[hits, 'source'] = os.path.basename(GEOCODE_CACHE)
+    result['Continent'] = result['Continent'].fillna(result['ISO3'].map(CONTINENT_OVERRIDES))
+
+    has_coordinates = (result['latitude'].notna() & result['longitude'].notna()).to_numpy()
+    has_continent = result['Continent'].notna().to_numpy()
+    outside = has_coordinates & has_continent & ~in_continent(
+        result['Continent'], result['latitude'], result['longitude'])
+    shared = has_coordinates & ~outside & result.duplicated(['latitude', 'longitude'], keep=False).to_numpy()
+    checks = [
+        (pd.isna(iso3), 'no ISO-3 code'),
+        (~matched, 'not in countries.csv'),
+        (~has_continent, 'no continent'),
+        (~has_coordinates, 'no coordinates'),
+        (outside, 'coordinates outside its continent'),
+        (shared, 'coordinates shared with another country'),
+    ]
+    result['issue'] = ['; '.join(issue for mask, issue in checks if mask[position])
+                       for position in range(len(names))]
+    # A wrong position is worse than none: suspect coordinates are dropped until refreshed
+    result.loc[outside | shared, ['latitude', 'longitude']] = np.nan
+    return result
+
+
+def enrich(df, reference, cache=None):
+    """Rename the countries of `df` and add COLUMNS, resolving each distinct name once."""
+    codes, names = pd.factorize(df['Country'])
+    resolved = resolve(names, reference, cache)
+    df = df.copy()
+    df['Country'] = resolved['Country'].to_numpy()[codes]
+    for column in COLUMNS:
+        df[column] = resolved[column].to_numpy()[codes]
+    return df
+
+
+def unresolved_report(resolved):
+    """Names with an issue, one line each."""
+    problems = resolved[resolved['issue'] != '']
+    if problems.empty:
+        return f'All {len(resolved)} names resolved.'
+    lines = [f'{len(problems)} of {len(resolved)} names with issues:']
+    for name, row in problems.iterrows():
+        renamed = f' (as {row["Country"]})' if row['Country'] != name else ''
+        lines.append(f'  {name}{renamed}: {row["issue"]}')
+    return '\n'.join(lines)
+
+
+class RateLimiter:
+    """At most `rate` calls per second across threads, spaced evenly."""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self.next_call = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_call)
+            self.next_call = slot + self.interval
+        time.sleep(slot - now)
+
+
+class TableGeocoder:
+    """Stand-in geocoder answering from a table, with geopy's geocode() interface."""
+
+    def __init__(self, coordinates, delay=0.0):
+        self.coordinates = {name: (float(latitude), float(longitude))
+                            for name, (latitude, longitude) in coordinates.items()}
+        self.delay = delay
+        self.queries = []
+
+    @classmethod
+    def from_csv(cls, path, delay=0.0):
+        """From a CSV with Country, latitude and longitude columns."""
+        table = pd.read_csv(path)
+        return cls(dict(zip(table['Country'], zip(table['latitude'], table['longitude']))), delay)
+
+    def geocode(self, query, **kwargs):
+        self.queries.append(query)
+        time.sleep(self.delay)
+        if query not in self.coordinates:
+            return None
+        return Location(query, *self.coordinates[query])
+
+
+def refresh_geocodes(resolved, geocoder, cache_path=GEOCODE_CACHE, rate=1.0, workers=4, force=False):
+    """Geocode the countries missing from the cache and store the plausible results.
+
+    Requests are spread over `workers` threads, at most `rate` per second. A
+    result outside the country's continent is rejected. Returns the names that
+    could not be geocoded, with the reason.
+    """
+    cache = read_geocode_cache(cache_path)
+    targets = resolved.dropna(subset=['ISO3']).drop_duplicates('ISO3')
+    if not force:
+        targets = targets[~targets['ISO3'].isin(list(cache))]
+    limiter = RateLimiter(rate)
+
+    def geocode(country):
+        limiter.wait()
+        try:
+            return geocoder.geocode(country, exactly_one=True, featuretype='country')
+        except Exception as error: # a failed request is reported, the batch goes on
+            return error
+
+    failures = {}
+    updated = datetime.date.today().isoformat()
+    with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+        results = pool.map(geocode, targets['Country'])
+        for (_, target), location in zip(targets.iterrows(), results):
+            if isinstance(location, Exception):
+                failures[target['Country']] = f'request failed: {location}'
+            elif location is None:
+                failures[target['Country']] = 'not found'
+            elif pd.notna(target['Continent']) and not in_continent(
+                    [target['Continent']], [location.latitude], [location.longitude])[0]:
+                failures[target['Country']] = (f'{location.latitude:.2f}, {location.longitude:.2f} '
+                                               f'is outside {target["Continent"]}')
+            else:
+                cache[target['ISO3']] = {'query': target['Country'], 'latitude': location.latitude,
+                                         'longitude': location.longitude, 'updated': updated}
+    write_geocode_cache(cache, cache_path)
+    return failures
+
+
+def main():
+    from dataviz.data import LIFE_EXPECTANCY_CSV
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--refresh', action='store_true', help='geocode the countries missing from the cache')
+    parser.add_argument('--force', action='store_true', help='with --refresh, geocode every country again')
+    parser.add_argument('--stand-in', metavar='CSV',
+                        help='geocode from a CSV (Country, latitude, longitude) instead of Nominatim')
+    parser.add_argument('--user-agent', default='life-expectancy-dashboard', help='Nominatim user agent')
+    parser.add_argument('--rate', type=float, default=1.0, help='requests per second (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=4, help='concurrent requests (default: %(default)s)')
+    args = parser.parse_args()
+
+    names = pd.read_csv(LIFE_EXPECTANCY_CSV, usecols=['Country'])['Country'].unique()
+    reference = pd.read_csv(COUNTRIES_CSV)
+    if args.refresh:
+        if args.stand_in:
+            geocoder = TableGeocoder.from_csv(args.stand_in)
+        else:
+            from geopy.geocoders import Nominatim
+
+            geocoder = Nominatim(user_agent=args.user_agent)
+        start = time.perf_counter()
+        failures = refresh_geocodes(resolve(names, reference, {}), geocoder, rate=args.rate,
+                                    workers=args.workers, force=args.force)
+        print(f'Refreshed {GEOCODE_CACHE} in {time.perf_counter() - start:.1f}s')
+        for country, reason in failures.items():
+            print(f'  {country}: {reason}')
+    print(unresolved_report(resolve(names, reference)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Aggregate cube behind the groupby-driven charts.
+
+The cube holds, for every Year x Status x Continent x Country cell, the sum,
+count of non-missing values and sum of squares of each indicator. Those three
+statistics are additive, so any coarser grouping is a re-aggregation of cells
+instead of another scan of the rows, and appending rows only aggregates the new
+rows. Missing Status/Continent values are kept as their own cells, so totals
+over a dimension match a groupby on the raw frame.
+"""
+import numpy as np
+import pandas as pd
+
+from dataviz.profiling import data_prep
+
+KEYS = ['Year', 'Status', 'Continent', 'Country']
+STATS = ['sum', 'count', 'sumsq']
+
+
+def indicator_columns(df):
+    """Numeric columns that are measured, as opposed to keys or coordinates."""
+    numeric = df.select_dtypes(include='number').columns
+    return [column for column in numeric if column not in ('Year', 'latitude', 'longitude')]
+
+
+def build_cube(df, measures=None):
+    """Aggregate `df` into one row per Year/Status/Continent/Country cell."""
+    measures = measures or indicator_columns(df)
+    values = df[measures].astype(np.float64)
+    filled = values.fillna(0)
+    stats = pd.concat(
+        {'sum': filled, 'count': values.notna().astype(np.int64), 'sumsq': filled ** 2},
+        axis=1,
+    )
+    # (measure, stat) columns, e.g. ('GDP', 'sum')
+    stats.columns = stats.columns.swaplevel()
+    stats = stats.sort_index(axis=1, level=0, sort_remaining=False)
+    return stats.groupby([df[key] for key in KEYS], observed=True, dropna=False).sum()
+
+
+def append_rows(cube, rows):
+    """Return `cube` updated with new `rows`, e.g. a newly published year.
+
+    Only `rows` are aggregated; cells already in the cube are added to.
+    """
+    cube = pd.concat([cube, build_cube(rows, list(cube.columns.unique(level=0)))])
+    return cube.groupby(level=KEYS, observed=True, dropna=False).sum()
+
+
+@data_prep
+def slice_cube(cube, by, measures, stat='mean'):
+    """Aggregate the cube by the `by` keys, like df.groupby(by)[measures].<stat>().
+
+    `stat` is 'mean', 'sum', 'count' or 'std' (sample standard deviation).
+    Missing values are skipped the way pandas skips them. Keys with missing
+    values are dropped, as groupby does by default.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    grouped = cube[measures].groupby(level=by, observed=True).sum()
+    sums = grouped.xs('sum', axis=1, level=1)
+    counts = grouped.xs('count', axis=1, level=1)
+    if stat == 'sum':
+        result = sums
+    elif stat == 'count':
+        result = counts
+    elif stat == 'mean':
+        result = sums / counts.where(counts > 0)
+    elif stat == 'std':
+        sumsq = grouped.xs('sumsq', axis=1, level=1)
+        variance = (sumsq - sums ** 2 / counts) / (counts - 1).where(counts > 1)
+        result = np.sqrt(variance.clip(lower=0))
+    else:
+        raise ValueError(f'Unknown statistic: {stat!r}')
+
+    result = result[measures].reset_index()
+    result.columns.name = None
+    # Small frames, and plotly express handles plain columns better than categoricals
+    categorical = [key for key in by if isinstance(result[key].dtype, pd.CategoricalDtype)]
+    return result.astype({key: object for key in categorical})
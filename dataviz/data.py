@@ -0,0 +1,205 @@
+"""Loading and preparation of the life expectancy dataset.
+
+The CSVs are parsed, cleaned, typed and merged once, then stored as a columnar
+snapshot (see dataviz/snapshot.py). Startup memory-maps that snapshot instead
+of parsing CSV. The snapshot is named after the modification time and size of
+the CSVs and the geocode cache, so editing one rebuilds it into a new file. The
+loaded frame is cached once per server process and every session gets the same
+frame. The frame is immutable: its columns are read-only views of the mapped
+file, sorted by year so that a year is a contiguous slice (see year_rows). The
+snapshot also holds the indicators with their gaps filled (see
+dataviz/imputation.py), loaded as a second Dataset for the charts that include
+imputed values.
+"""
+import hashlib
+import json
+import os
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dataviz import DATA_DIR, cube, imputation, snapshot
+from dataviz import countries as country_metadata
+from dataviz.query import Filters, QueryIndex, filter_correlation, filter_cube
+from dataviz.table import TableIndex
+from dataviz.correlation import build_correlation_stats
+
+LIFE_EXPECTANCY_CSV = os.path.join(DATA_DIR, 'Life Expectancy Data.csv')
+COUNTRIES_CSV = country_metadata.COUNTRIES_CSV
+GEOCODE_CACHE = country_metadata.GEOCODE_CACHE
+
+# Everything the figure builders need: the shared frame, its aggregate cube, the
+# correlation statistics and the fingerprint identifying them in caches.
+# Cached helpers that take rows of a Dataset (e.g. regression.cached_fit_lines)
+# do not hash the frame, passed as `_df`; their `key` stands for its rows
+# instead: the fingerprint plus whatever selected the rows, e.g. a year.
+Dataset = namedtuple('Dataset', ['df', 'cube', 'correlation', 'fingerprint'])
+
+CATEGORICAL_COLUMNS = ['Country', 'Status', 'Continent', 'ISO3']
+# Columns added by the country resolution
+COUNTRY_COLUMNS = country_metadata.COLUMNS
+
+
+def normalize_column_name(name):
+    """' thinness  1-19 years' -> 'Thinness 1-19 years'"""
+    name = re.sub(r'\s+', ' ', name).strip()
+    return name[:1].upper() + name[1:]
+
+
+def source_version(paths=(LIFE_EXPECTANCY_CSV, COUNTRIES_CSV, GEOCODE_CACHE)):
+    """Cheap fingerprint of the source files: (mtime, size) of each one, (0, 0) if missing."""
+    version = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            version.append((0, 0))
+        else:
+            version.append((stat.st_mtime, stat.st_size))
+    return tuple(version)
+
+
+def dataset_fingerprint():
+    """Short hash identifying the prepared dataset: its sources and snapshot format."""
+    key = json.dumps([snapshot.FORMAT_VERSION, source_version()])
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def prepare(raw, countries):
+    """Resolve the countries' metadata (see dataviz/countries.py) and type the columns."""
+    df = raw.rename(columns=normalize_column_name)
+    # Resolved once per distinct name, so the maps never match names in the browser
+    df = country_metadata.enrich(df, countries)
+
+    for column in CATEGORICAL_COLUMNS:
+        df[column] = df[column].astype('category')
+    df['Year'] = df['Year'].astype(np.int16)
+    numeric_columns = df.columns.difference(CATEGORICAL_COLUMNS + ['Year'])
+    df[numeric_columns] = df[numeric_columns].astype(np.float32)
+    return df.sort_values(['Year', 'Country'], ignore_index=True)
+
+
+def build_snapshot(version=None):
+    """Parse the CSVs, write the snapshot of `version` (the current one) and return the prepared frame."""
+    version = version or source_version()
+    df = prepare(pd.read_csv(LIFE_EXPECTANCY_CSV), pd.read_csv(COUNTRIES_CSV))
+    filled, mask = imputation.impute(df)
+    snapshot.write_snapshot(df, version, DATA_DIR, filled=filled, mask=mask)
+    return df
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _load_dataset(version, imputed=False):
+    path = snapshot.snapshot_path(version, DATA_DIR)
+    if not os.path.exists(path):
+        build_snapshot(version)
+    return snapshot.read_snapshot(path, imputed=imputed)
+
+
+def load_dataset():
+    """Return the merged frame shared by every session of this process.
+
+    The frame is shared and its columns are read-only views of the
+    memory-mapped snapshot: writing to it raises. Work on views (year_rows,
+    column selections, iloc slices) rather than copies.
+    """
+    return _load_dataset(source_version())
+
+
+def year_rows(df, year):
+    """Rows of `year` as a zero-copy slice of the shared, year-sorted frame."""
+    start, stop = np.searchsorted(df['Year'].to_numpy(), [year, year + 1])
+    return df.iloc[start:stop]
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _missing_values(version):
+    return _load_dataset(version).isna().sum()
+
+
+def missing_values():
+    """Missing values per column of the shared frame, counted once per process."""
+    return _missing_values(source_version())
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _imputed_values(version):
+    _load_dataset(version) # builds the snapshot if needed
+    return snapshot.read_imputation_mask(snapshot.snapshot_path(version, DATA_DIR)).sum()
+
+
+def imputed_values():
+    """Values filled by the imputation stage per column, counted once per process."""
+    return _imputed_values(source_version())
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _table_index(version):
+    return TableIndex(_load_dataset(version))
+
+
+def table_index():
+    """Sort orders and lookups behind the paginated tables (see dataviz/table.py)."""
+    return _table_index(source_version())
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _load_cube(version, imputed=False):
+    return cube.build_cube(_load_dataset(version, imputed))
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _load_correlation(version, imputed=False):
+    df = _load_dataset(version, imputed)
+    stats = build_correlation_stats(df, df.select_dtypes(include='float32').columns)
+    for array in (stats.n, stats.sx, stats.sxx, stats.sxy):
+        array.setflags(write=False)
+    return stats
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _query_index(version):
+    return QueryIndex(_load_dataset(version))
+
+
+def _fingerprint(filters, imputed):
+    if filters == Filters() and not imputed:
+        return dataset_fingerprint()
+    key = json.dumps([dataset_fingerprint(), filters, imputed], default=str)
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _load_selection(version, filters, imputed=False):
+    # The imputed frame has the same keys in the same order, so the index is shared
+    rows = _query_index(version).rows(filters)
+    df = _load_dataset(version, imputed)
+    if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+        df = df.iloc[rows[0]:rows[-1] + 1] # e.g. a year range: a view, not a copy
+    else:
+        df = df.iloc[rows]
+    # Only the selected values remain categories, as plotly express expects; the
+    # shallow copy replaces these columns and still shares the others
+    df = df.copy(deep=False)
+    for column in CATEGORICAL_COLUMNS:
+        df[column] = df[column].cat.remove_unused_categories()
+    correlation = filter_correlation(_load_correlation(version, imputed), df, filters)
+    return Dataset(df, filter_cube(_load_cube(version, imputed), filters), correlation,
+                   _fingerprint(filters, imputed))
+
+
+def load(filters=Filters(), imputed=False):
+    """Return the shared Dataset of this process, or of the rows matching `filters`.
+
+    Selections are cached per process too, so every session filtering the same
+    way shares one Dataset. With `imputed`, the indicators have their gaps
+    filled, as stored in the snapshot.
+    """
+    version = source_version()
+    if filters == Filters():
+        return Dataset(_load_dataset(version, imputed), _load_cube(version, imputed),
+                       _load_correlation(version, imputed), _fingerprint(filters, imputed))
+    return _load_selection(version, filters, imputed)
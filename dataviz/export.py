@@ -0,0 +1,266 @@
+"""Static export of the dashboard, for deployments without a live Python session per viewer.
+
+    python -m dataviz.export                          # into site/
+    python -m dataviz.export --output /srv/kiosk --workers 4
+
+The bundle is self-contained:
+
+- index.html: the narrative, and a placeholder per figure that is drawn when
+  scrolled into view;
+- plotly.min.js: one copy of Plotly for every figure, the version the figures
+  were built with;
+- figures/section_<n>.json: each figure, built with its builder's default
+  parameters (the maps animated over the years);
+- manifest.json: the dataset fingerprint and code version the figures were
+  built from, and each figure's parameters. It is written last, so a bundle
+  being rebuilt is never read half-written.
+
+The figures do not depend on each other, so they are built in a process pool;
+each worker maps the snapshot once. The figure JSON is the same the app would
+render, so the app serves a figure from the bundle when the manifest matches
+the running dataset and code and the figure is asked for with the same
+parameters (see open_export), and renders it live otherwise. Browsers do not
+fetch files from file:// pages; serve the directory, e.g. with
+`python -m http.server -d site`.
+"""
+import argparse
+import concurrent.futures
+import datetime
+import html
+import inspect
+import json
+import logging
+import os
+import shutil
+import time
+
+import streamlit as st
+
+from dataviz import ROOT_DIR, narrative
+from dataviz.figure_cache import code_version
+
+EXPORT_DIR = os.environ.get('DATAVIZ_EXPORT_DIR', os.path.join(ROOT_DIR, 'site'))
+MANIFEST = 'manifest.json'
+
+# Placeholder colors of Streamlit's Plotly template, as its frontend resolves them
+# for a chart without the Streamlit theme: Plotly's default palettes
+THEME_COLORS = dict(zip(
+    [f'#{number:06d}' for number in range(1, 41)],
+    ['#636efa', '#EF553B', '#00cc96', '#ab63fa', '#FFA15A', '#19d3f3', '#FF6692', '#B6E880', '#FF97FF', '#FECB52',
+     '#0d0887', '#46039f', '#7201a8', '#9c179e', '#bd3786', '#d8576b', '#ed7953', '#fb9f3a', '#fdca26', '#f0f921',
+     '#8e0152', '#c51b7d', '#de77ae', '#f1b6da', '#fde0ef', '#f7f7f7', '#e6f5d0', '#b8e186', '#7fbc41', '#4d9221',
+     '#276419', '#3D9970', '#FF4136', '#4499FF', '#e6eaf1', '#808495', '#262730', '#ffffff', 'rgba(49, 51, 63, 0.1)',
+     '#f8f9fb'],
+))
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+  body {{ font-family: "Source Sans Pro", sans-serif; color: #31333F; max-width: 80vw; margin: 2rem auto; }}
+  h1 {{ text-align: center; color: #3E9DF3; font-size: 80px; }}
+  h2.authors {{ text-align: center; color: #9A5DFB; font-size: 50px; }}
+  h2 {{ border-bottom: 2px solid #3E9DF3; }}
+  h3 {{ border-bottom: 2px solid #9A5DFB; }}
+  .text-comments {{ font-size: 20px; }}
+  .figure {{ min-height: 800px; }}
+</style>
+</head>
+<body>
+{body}
+<script src="plotly.min.js"></script>
+<script>
+const THEME_COLORS = {colors};
+const drawn = new IntersectionObserver(entries => {{
+  for (const entry of entries) {{
+    if (!entry.isIntersecting) continue;
+    const element = entry.target;
+    drawn.unobserve(element);
+    fetch(element.dataset.src)
+      .then(response => response.text())
+      .then(text => {{
+        const figure = JSON.parse(text.replace(/#0000[0-4][0-9]/g, color => THEME_COLORS[color] || color));
+        return Plotly.newPlot(element, figure.data, figure.layout, {{responsive: true}})
+          .then(() => figure.frames && Plotly.addFrames(element, figure.frames));
+      }});
+  }}
+}}, {{rootMargin: '400px'}});
+document.querySelectorAll('.figure').forEach(element => drawn.observe(element));
+</script>
+</body>
+</html>
+"""
+
+
+def default_params(section):
+    """Keyword arguments of the section's builder, with their default values."""
+    parameters = list(inspect.signature(section.build).parameters.values())[1:]
+    return {parameter.name: parameter.default for parameter in parameters}
+
+
+def _params_key(params):
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def figure_file(number):
+    return f'figures/section_{number}.json'
+
+
+# The dataset of a worker process, loaded once by _init_worker
+_data = None
+
+
+def _quiet_caches():
+    # Outside `streamlit run` the caches warn that they are per process, as intended here
+    for name in ('cache_data_api', 'cache_resource_api'):
+        logging.getLogger(f'streamlit.runtime.caching.{name}').setLevel(logging.ERROR)
+
+
+def _init_worker():
+    global _data
+    from dataviz.data import load
+
+    _quiet_caches()
+    _data = load()
+
+
+def _render(number):
+    """Build one figure in a worker; return (number, figure JSON, seconds)."""
+    from dataviz.sections import SECTIONS
+
+    section = next(section for section in SECTIONS if section.number == number)
+    start = time.perf_counter()
+    spec = section.build(_data, **default_params(section)).to_json()
+    return number, spec, time.perf_counter() - start
+
+
+def _paragraphs(paragraphs):
+    return '\n'.join(f'<p class="text-comments">{html.escape(paragraph)}</p>' for paragraph in paragraphs)
+
+
+def page_body(sections):
+    """The narrative of the app, with a placeholder per figure."""
+    parts = [
+        f'<h1>{html.escape(narrative.TITLE)}</h1>',
+        f'<h2 class="authors">{html.escape(narrative.AUTHORS)}</h2>',
+        f'<p>The GitHub link : <a href="{narrative.GITHUB_URL}">{narrative.GITHUB_URL}</a></p>',
+        '<h2>Context and motivation</h2>',
+        _paragraphs(narrative.CONTEXT),
+        f'<p>The link : <a href="{narrative.DATASET_URL}">{narrative.DATASET_URL}</a></p>',
+        '<h2>Columns</h2>',
+        '\n'.join(f'<p class="text-comments"><strong>{html.escape(key)}:</strong> {html.escape(value)}</p>'
+                  for key, value in narrative.COLUMNS.items()),
+        '<h2>Creation of new columns</h2>',
+        _paragraphs([narrative.NEW_COLUMNS]),
+    ]
+    for section in sections:
+        if section.header:
+            parts.append(f'<h2>{html.escape(section.header)}</h2>')
+        parts.append(f'<h3>{html.escape(section.title)}</h3>')
+        parts.append(f'<div class="figure" data-src="{figure_file(section.number)}"></div>')
+        parts.append(_paragraphs([section.comment]))
+    parts.append('<h2>Conclusion</h2>')
+    parts.append(_paragraphs(narrative.CONCLUSION))
+    return '\n'.join(parts)
+
+
+def export(output=EXPORT_DIR, workers=None):
+    """Build every figure in a process pool and write the static bundle into `output`."""
+    import plotly
+    from plotly.offline import get_plotlyjs
+
+    from dataviz.data import dataset_fingerprint, load_dataset
+    from dataviz.sections import SECTIONS
+
+    load_dataset() # writes the snapshot once, before the workers map it
+    os.makedirs(os.path.join(output, 'figures'), exist_ok=True)
+    manifest_path = os.path.join(output, MANIFEST)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path) # the bundle is stale until the new manifest is written
+
+    sections = {section.number: section for section in SECTIONS}
+    figures = {}
+    start = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+        for number, spec, seconds in pool.map(_render, list(sections)):
+            with open(os.path.join(output, figure_file(number)), 'w', encoding='utf-8') as file:
+                file.write(spec)
+            figures[str(number)] = {'file': figure_file(number), 'params': default_params(sections[number]),
+                                    'bytes': len(spec), 'seconds': seconds}
+            print(f'  section {number:>2}  {seconds:6.2f}s  {len(spec) / 1024:8.1f} KiB')
+    wall = time.perf_counter() - start
+
+    with open(os.path.join(output, 'plotly.min.js'), 'w', encoding='utf-8') as file:
+        file.write(get_plotlyjs())
+    with open(os.path.join(output, 'index.html'), 'w', encoding='utf-8') as file:
+        file.write(PAGE.format(title=html.escape(narrative.TITLE), body=page_body(SECTIONS),
+                               colors=json.dumps(THEME_COLORS)))
+
+    manifest = {
+        'fingerprint': dataset_fingerprint(),
+        'code_version': code_version(),
+        'plotly_version': plotly.__version__,
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'figures': figures,
+    }
+    with open(f'{manifest_path}.tmp', 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=1, default=str)
+    os.replace(f'{manifest_path}.tmp', manifest_path)
+    print(f'{len(figures)} figures in {wall:.2f}s '
+          f'({sum(figure["seconds"] for figure in figures.values()):.2f}s of building), written to {output}')
+    return manifest
+
+
+class Export:
+    """Figures of an up-to-date bundle, looked up by section number and parameters."""
+
+    def __init__(self, directory, manifest):
+        self.directory = directory
+        self.figures = {int(number): figure for number, figure in manifest['figures'].items()}
+
+    def get(self, figure_id, params=None):
+        """Return the prebuilt figure JSON, or None if it was built with other parameters."""
+        figure = self.figures.get(figure_id)
+        if figure is None or _params_key(figure['params']) != _params_key(params or {}):
+            return None
+        try:
+            with open(os.path.join(self.directory, figure['file']), encoding='utf-8') as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _open_export(dataset_fingerprint, directory, manifest_mtime):
+    with open(os.path.join(directory, MANIFEST), encoding='utf-8') as file:
+        manifest = json.load(file)
+    if manifest['fingerprint'] != dataset_fingerprint or manifest['code_version'] != code_version():
+        return None
+    return Export(directory, manifest)
+
+
+def open_export(dataset_fingerprint, directory=EXPORT_DIR):
+    """The bundle in `directory` if it was built from this dataset and code, else None."""
+    try:
+        mtime = os.stat(os.path.join(directory, MANIFEST)).st_mtime
+    except FileNotFoundError:
+        return None
+    return _open_export(dataset_fingerprint, directory, mtime)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--output', default=EXPORT_DIR, help='directory of the bundle (default: %(default)s)')
+    parser.add_argument('--workers', type=int, help='worker processes (default: one per CPU)')
+    parser.add_argument('--clean', action='store_true', help='empty the output directory first')
+    args = parser.parse_args()
+    _quiet_caches()
+    if args.clean and os.path.isdir(args.output):
+        shutil.rmtree(args.output)
+    export(args.output, args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""Figure JSON cache on disk, shared by every worker process.
+
+Entries are keyed on the dataset fingerprint, the figure id and the figure
+parameters. A warm entry is sent to the browser as-is: no Plotly object is built
+and nothing is serialized again. Reads refresh an entry's mtime and the oldest
+entries are evicted once the directory grows past its size cap (LRU). Entries
+of another dataset fingerprint are purged when a cache is opened.
+
+The cache lives in .figure_cache/ next to the app; DATAVIZ_FIGURE_CACHE_DIR and
+DATAVIZ_FIGURE_CACHE_MB override the directory and the cap.
+"""
+import functools
+import glob
+import hashlib
+import json
+import os
+import tempfile
+
+import streamlit as st
+
+from dataviz import ROOT_DIR
+from dataviz.profiling import phase
+
+CACHE_DIR = os.environ.get('DATAVIZ_FIGURE_CACHE_DIR', os.path.join(ROOT_DIR, '.figure_cache'))
+MAX_BYTES = int(float(os.environ.get('DATAVIZ_FIGURE_CACHE_MB', 256)) * 1024 * 1024)
+
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    """Hash of the dataviz sources, so editing a figure builder invalidates its entries."""
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(ROOT_DIR, 'dataviz', '*.py'))):
+        with open(path, 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+class FigureCache:
+
+    def __init__(self, dataset_fingerprint, directory=CACHE_DIR, max_bytes=MAX_BYTES):
+        key = f'{dataset_fingerprint}:{code_version()}'
+        self.fingerprint = hashlib.sha256(key.encode()).hexdigest()[:16]
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.purge_stale()
+
+    def _path(self, figure_id, params):
+        key = json.dumps([figure_id, params], sort_keys=True, default=str)
+        digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return os.path.join(self.directory, f'{self.fingerprint}-{digest}.json')
+
+    def _entries(self):
+        """(path, stat) of every entry, oldest first."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.json'):
+                try:
+                    entries.append((entry.path, entry.stat()))
+                except FileNotFoundError: # evicted by another process meanwhile
+                    pass
+        return sorted(entries, key=lambda item: item[1].st_mtime)
+
+    def get(self, figure_id, params=None):
+        """Return the cached figure JSON, or None."""
+        path = self._path(figure_id, params)
+        try:
+            with open(path, encoding='utf-8') as file:
+                spec = file.read()
+            os.utime(path) # most recently used
+        except FileNotFoundError:
+            return None
+        return spec
+
+    def put(self, figure_id, params, spec):
+        path = self._path(figure_id, params)
+        # One temporary file per writer: sessions are threads of one process
+        descriptor, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with open(descriptor, 'w', encoding='utf-8') as file:
+            file.write(spec)
+        # Atomic, so other processes never read half an entry
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def get_or_build(self, figure_id, params, build):
+        """Return the figure JSON, calling `build()` for the figure on a miss."""
+        spec = self.get(figure_id, params)
+        if spec is None:
+            with phase('build'):
+                fig = build()
+            with phase('serialize'):
+                spec = fig.to_json()
+            self.put(figure_id, params, spec)
+        return spec
+
+    def evict(self):
+        """Delete the least recently used entries until the cache fits its cap."""
+        entries = self._entries()
+        total = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= stat.st_size
+
+    def purge_stale(self):
+        """Delete the entries built from another version of the dataset."""
+        for path, _ in self._entries():
+            if not os.path.basename(path).startswith(f'{self.fingerprint}-'):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def open_cache(dataset_fingerprint):
+    """The process-wide cache of a dataset; opening it purges older entries."""
+    return FigureCache(dataset_fingerprint)
+
+
+def plotly_chart_json(spec, use_container_width=True):
+    """Like st.plotly_chart, for a figure that is already serialized to JSON.
+
+    st.plotly_chart rebuilds and validates a Plotly figure from whatever it is
+    given, which is the work the cache exists to skip.
+    """
+    from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+
+    proto = PlotlyChartProto()
+    proto.use_container_width = use_container_width
+    proto.theme = 'streamlit'
+    proto.figure.spec = spec
+    proto.figure.config = json.dumps({'showLink': False, 'linkText': False})
+    return st._main._enqueue('plotly_chart', proto)
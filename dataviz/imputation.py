@@ -0,0 +1,67 @@
+"""Optional gap filling of the indicators, computed once when the snapshot is built.
+
+A missing value is filled, in order of preference, with:
+
+- a linear interpolation in time between the country's nearest earlier and
+  later observations;
+- the mean of the observed values of the same continent and year, for gaps at
+  the start or end of a country's series (or countries without any value).
+
+Gaps with neither, e.g. a country without a continent, stay missing. Every
+column is filled at once: the rows are ordered by country and year, and the
+nearest observations come from running maxima/minima of row positions instead
+of a loop over countries. The filled columns and a mask of the imputed cells
+are stored in the snapshot (see dataviz/snapshot.py) and charts opt in to them
+one at a time.
+"""
+import numpy as np
+import pandas as pd
+
+from dataviz.cube import indicator_columns
+
+
+def interpolate_in_time(values, groups, years):
+    """Fill the interior gaps of each group's series, linearly in `years`.
+
+    `values` is a (rows, columns) array whose rows are sorted by group, then
+    year. Leading and trailing gaps are left missing.
+    """
+    rows = len(values)
+    positions = np.arange(rows)[:, None]
+    present = ~np.isnan(values)
+    # First and last row of each row's group
+    new_group = np.r_[True, groups[1:] != groups[:-1]]
+    group_start = np.maximum.accumulate(np.where(new_group, np.arange(rows), 0))
+    group_end = np.minimum.accumulate(np.where(np.r_[new_group[1:], True], np.arange(rows), rows)[::-1])[::-1]
+    # Nearest observed row before and after each row, per column
+    previous = np.maximum.accumulate(np.where(present, positions, -1), axis=0)
+    following = np.minimum.accumulate(np.where(present, positions, rows)[::-1], axis=0)[::-1]
+    inside = ~present & (previous >= group_start[:, None]) & (following <= group_end[:, None])
+
+    previous, following = previous.clip(0, rows - 1), following.clip(0, rows - 1)
+    columns = np.arange(values.shape[1])
+    start, stop = values[previous, columns], values[following, columns]
+    years = years.astype(np.float64)
+    span = years[following] - years[previous]
+    weight = np.divide(years[:, None] - years[previous], span, out=np.zeros_like(span), where=span > 0)
+    return np.where(inside, start + weight * (stop - start), values)
+
+
+def impute(df, columns=None):
+    """Return (filled, mask): `columns` of `df` with their gaps filled, and which cells were."""
+    columns = columns or indicator_columns(df)
+    values = df[columns].to_numpy(dtype=np.float64)
+    countries = df['Country'].cat.codes.to_numpy()
+    years = df['Year'].to_numpy()
+
+    order = np.lexsort((years, countries))
+    filled = np.empty_like(values)
+    filled[order] = interpolate_in_time(values[order], countries[order], years[order])
+
+    # Observed means of each continent and year, broadcast back to the rows
+    means = df[columns].groupby([df['Continent'], df['Year']], observed=True).transform('mean')
+    filled = np.where(np.isnan(filled), means.to_numpy(dtype=np.float64), filled)
+
+    mask = np.isnan(values) & ~np.isnan(filled)
+    return (pd.DataFrame(filled.astype(np.float32), index=df.index, columns=columns),
+            pd.DataFrame(mask, index=df.index, columns=columns))
@@ -0,0 +1,47 @@
+"""Narrative text of the dashboard, shared by the app and the static export."""
+
+TITLE = 'Dataviz final project'
+AUTHORS = 'Lucas Artaud & Iswarya Sivasubramaniam DIA 1'
+GITHUB_URL = 'https://github.com/Iswarya1011/Dataviz_Project'
+DATASET_URL = 'https://www.kaggle.com/datasets/kumarajarshi/life-expectancy-who'
+
+CONTEXT = [
+    'The data set chosen is a statistical data on factors influencing Life Expectancy. The data comes from the World Health Organization over a 15-year period.',
+    'Many studies in the past have explored the factors influencing life expectancy, centering around demographic variables, income composition, and mortality rates. However, these studies often neglected the impact of immunization and the Human Development Index. Additionally, some prior research relied on a one-year dataset for all countries but doing this research for a period of time of 15 year enables us to visualise the changes over time. This data set allows us to do a country based observation to identify the main factors that are contributing to lower life expectancy.',
+    'This dataset encompasses health factors for 193 countries from 2000 to 2015, with 22 columns and 2938 rows. Our preliminary analysis indicates that the population, Hepatitis B, and GDP columns contain the majority of missing data. Rather than removing all missing values and losing valuable information, we have opted to retain the incomplete rows.',
+    "The project's motivation is to analyze various factors influencing life expectancy, comparing them on different scales such as continents and development statuses.",
+    'The objective is to gain insights into factors affecting life expectancy, guiding public health interventions and policies. Targeted healthcare initiatives could be guided, for instance, by identifying particular regions or demographic groups experiencing challenges with life expectancy. Furthermore, knowledge of how social determinants, economic variables, and immunizations affect life expectancy can support evidence-based decision-making at the national and international levels.',
+]
+
+COLUMNS = {
+    'Country': 'Country',
+    'Year': 'Year',
+    'Status': "Classification of countries as 'developed' or 'developing' based on their gross domestic product(GDP).",
+    'Life expectancy': 'Life expectancy (years of age)',
+    'Adult Mortality': 'Adult Mortality Rates of both sexes (Probability of dying between 15 and 60 years per 1000 population)',
+    'Infant deaths': 'Number of Infant (0-1 year of age) Deaths per 1000 population.',
+    'Alcohol': 'Alcohol, recorded per capita (15+) consumption (in litres of pure alcohol).',
+    'Percentage expenditure': 'Expenditure on health as a percentage of GPD per capita. (%)',
+    'Hepatitis B': 'Hepatitis B immunization coverage among 1-year-olds. (%)',
+    'Measles': 'Number of reported cases per 1000 population.',
+    'BMI': 'Average Body Mass index of entire population',
+    'Under-five deaths': 'Number of under-five deaths per 1000 population',
+    'Polio': 'Polio immunization coverage among 1-year-olds (%)',
+    'Total expenditure': 'General government expenditure on health as a percentage of total government expenditure (%)',
+    'Diphtheria': 'Diphtheria tetanus toxoid and pertussis (DTP3) immunization coverage among 1-year-olds (%)',
+    'HIV/AIDS': 'Deaths per 1000 live births HIV/AIDS (0-4 years)',
+    'GDP': 'Gross Domestic Product per capita (in USD)',
+    'Population': 'Population of the country',
+    'Thinness 1-19 years': 'Prevalence of thinness among children and adolescents for Age 10 to 19 (%)',
+    'Thinness 5-9 years': 'Prevalence of thinness among children for Age 5 to 9 (%)',
+    'Income composition of resources': 'Human Development Index in terms of income composition of resources (index ranging from 0 to 1)',
+    'Schooling': 'Number of years of Schooling (years)',
+}
+
+NEW_COLUMNS = 'With the library pycountry_convert we are going to create a new column "Continent" that will correspond to the continent of the country. And with Neonatim we are going to generate the latitude and longitude for each country in order to create maps.'
+
+CONCLUSION = [
+    'In conclusion, this study enabled us to see the evolution of life expectancy in different parts of the world and, more importantly, to identify the main factors influencing it and the continents/countries facing difficulties. Even though overall life expectancy has increased between 2000 and 2015, some parts of the world are less developed than others in certain aspects.',
+    'There is a significant gap between developed and developing countries, especially in GDP and life expectancy. Notably, Africa stands out with the lowest average life expectancy, demanding focused attention. To enhance life expectancy, prioritizing investments in education and income generation is imperative.',
+    'On the health aspect, we observe significant progress in the reduction of deaths from HIV and measles over the past 15 years. However, challenges persist in African and Asian countries, marked by lower average BMI, high rates of thinness among 1-19-year-olds, and elevated under-5 mortality. Authorities should concentrate on developing African and Asian countries to elevate life expectancy.',
+]
@@ -0,0 +1,132 @@
+"""Opt-in timing of each numbered section.
+
+Enabled with the ?profile=1 query parameter or DATAVIZ_PROFILE=1. Each section
+run gets a record splitting its time between:
+
+- prep: the data preparation helpers decorated with @data_prep (cube slices,
+  correlation merges, summaries, fits...), with the rows they read;
+- build: Plotly figure construction (the rest of the builder);
+- serialize: figure to JSON;
+- render: handing the JSON to Streamlit, plus the widgets of the section.
+
+A figure served from the figure cache has no build or serialize time. The
+records of a run are shown in a sidebar table and appended as JSON lines to
+DATAVIZ_PROFILE_LOG (profile.jsonl next to the app by default).
+"""
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import time
+
+from dataviz import ROOT_DIR
+
+LOG_PATH = os.environ.get('DATAVIZ_PROFILE_LOG', os.path.join(ROOT_DIR, 'profile.jsonl'))
+
+# The record of the section being run, if profiling
+_current = contextvars.ContextVar('section_profile', default=None)
+
+
+def enabled():
+    """Whether this run is profiled: DATAVIZ_PROFILE=1 or ?profile=1."""
+    if os.environ.get('DATAVIZ_PROFILE', '') not in ('', '0'):
+        return True
+    import streamlit as st
+
+    if hasattr(st, 'query_params'):
+        value = st.query_params.get('profile')
+    else:
+        value = (st.experimental_get_query_params().get('profile') or [None])[0]
+    return value not in (None, '', '0')
+
+
+@contextlib.contextmanager
+def profile_section(number, records):
+    """Profile the section run inside the block; its record is appended to `records`."""
+    record = {'section': number, 'params': {}, 'cache_hit': True, 'rows': 0,
+              'prep_s': 0.0, 'build_s': 0.0, 'serialize_s': 0.0}
+    token = _current.set(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        _current.reset(token)
+        record['total_s'] = time.perf_counter() - start
+        # Builders call the prep helpers, so prep is part of the build phase
+        record['build_s'] = max(record['build_s'] - record['prep_s'], 0.0)
+        record['render_s'] = record['total_s'] - record['prep_s'] - record['build_s'] - record['serialize_s']
+        record.pop('_prep_depth', None)
+        records.append(record)
+
+
+@contextlib.contextmanager
+def phase(name):
+    """Add the time spent in the block to the current record's `<name>_s`."""
+    record = _current.get()
+    if record is None:
+        yield
+        return
+    if name == 'build':
+        record['cache_hit'] = False
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record[f'{name}_s'] += time.perf_counter() - start
+
+
+def _rows(args):
+    for arg in args:
+        if hasattr(arg, 'shape') and len(arg.shape) == 2:
+            return arg.shape[0]
+        if hasattr(arg, 'groups') and hasattr(arg.groups, 'shape'): # correlation statistics
+            return arg.groups.shape[0]
+    return 0
+
+
+def data_prep(func):
+    """Count the calls to `func` as data preparation, with the rows of the frame it reads."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        record = _current.get()
+        # Only the outermost helper counts when they call each other
+        if record is None or record.get('_prep_depth'):
+            return func(*args, **kwargs)
+        record['_prep_depth'] = 1
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record['_prep_depth'] = 0
+            record['prep_s'] += time.perf_counter() - start
+            record['rows'] += _rows(list(args) + list(kwargs.values()))
+    return wrapper
+
+
+def write_log(records, path=LOG_PATH):
+    """Append the records as JSON lines, with a timestamp and the session id."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    session = ctx.session_id if ctx else None
+    now = time.time()
+    with open(path, 'a', encoding='utf-8') as file:
+        for record in records:
+            file.write(json.dumps({'time': now, 'session': session, **record}, default=str) + '\n')
+
+
+def show_sidebar(records):
+    import pandas as pd
+    import streamlit as st
+
+    st.sidebar.header('Profile')
+    if not records:
+        st.sidebar.write('No section was run.')
+        return
+    table = pd.DataFrame(records).set_index('section')
+    table['params'] = table['params'].map(lambda params: json.dumps(params, default=str) if params else '')
+    columns = ['prep_s', 'build_s', 'serialize_s', 'render_s', 'total_s']
+    table[columns] = (table[columns] * 1000).round(1)
+    table = table.rename(columns={column: column.replace('_s', ' ms') for column in columns})
+    st.sidebar.dataframe(table, use_container_width=True)
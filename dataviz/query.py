@@ -0,0 +1,120 @@
+"""Row selection behind the global Country/Continent/Year/Status filters.
+
+The QueryIndex is built once per process over the shared, year-sorted frame:
+
+- Year: each year is a contiguous slice of rows, found by binary search;
+- Country: the rows of each country, grouped by a stable argsort of its codes;
+- Continent and Status: one packed bitmap of rows (a bit per row) per value.
+
+The filters of a selection become bitmaps and are intersected with a bitwise
+and, so a selection never scans the columns themselves. The cube and the
+correlation statistics are already grouped by these keys, so they are filtered
+by their keys instead of by rows.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from dataviz.correlation import CorrelationStats, build_correlation_stats, group_mask
+from dataviz.cube import KEYS
+
+# Each field is a tuple of the selected values, or None for no filter
+Filters = namedtuple('Filters', ['countries', 'continents', 'years', 'statuses'], defaults=[None] * 4)
+
+
+class QueryIndex:
+    """Indexes of the shared frame's key columns, for intersecting filters."""
+
+    def __init__(self, df):
+        self.size = len(df)
+        years = df['Year'].to_numpy()
+        self.years = np.unique(years)
+        self.year_bounds = np.searchsorted(years, np.append(self.years, self.years[-1] + 1))
+
+        country = df['Country']
+        codes = country.cat.codes.to_numpy()
+        self.countries = country.cat.categories
+        self.country_order = np.argsort(codes, kind='stable')
+        self.country_bounds = np.searchsorted(codes[self.country_order], np.arange(len(self.countries) + 1))
+
+        self.bitmaps = {}
+        for column in ('Continent', 'Status'):
+            values = df[column]
+            codes = values.cat.codes.to_numpy()
+            self.bitmaps[column] = {value: np.packbits(codes == code)
+                                    for code, value in enumerate(values.cat.categories)}
+
+    def _slices_bitmap(self, bounds):
+        mask = np.zeros(self.size, dtype=bool)
+        for start, stop in bounds:
+            mask[start:stop] = True
+        return np.packbits(mask)
+
+    def year_bitmap(self, years):
+        positions = np.flatnonzero(np.isin(self.years, years))
+        return self._slices_bitmap(zip(self.year_bounds[positions], self.year_bounds[positions + 1]))
+
+    def country_bitmap(self, countries):
+        mask = np.zeros(self.size, dtype=bool)
+        for code in self.countries.get_indexer(list(countries)):
+            if code >= 0:
+                mask[self.country_order[self.country_bounds[code]:self.country_bounds[code + 1]]] = True
+        return np.packbits(mask)
+
+    def value_bitmap(self, column, values):
+        bitmaps = [self.bitmaps[column][value] for value in values if value in self.bitmaps[column]]
+        if not bitmaps:
+            return np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        return np.bitwise_or.reduce(bitmaps)
+
+    def rows(self, filters):
+        """Sorted positions of the rows matching every filter, or None when nothing is filtered."""
+        bitmaps = []
+        if filters.countries is not None:
+            bitmaps.append(self.country_bitmap(filters.countries))
+        if filters.continents is not None:
+            bitmaps.append(self.value_bitmap('Continent', filters.continents))
+        if filters.years is not None:
+            bitmaps.append(self.year_bitmap(np.asarray(filters.years)))
+        if filters.statuses is not None:
+            bitmaps.append(self.value_bitmap('Status', filters.statuses))
+        if not bitmaps:
+            return None
+        return np.flatnonzero(np.unpackbits(np.bitwise_and.reduce(bitmaps), count=self.size))
+
+
+def filter_cube(cube, filters):
+    """Cells of the cube matching the filters; its keys are the filtered columns."""
+    mask = np.ones(len(cube), dtype=bool)
+    for key, selected in zip(['Country', 'Continent', 'Year', 'Status'], filters):
+        if selected is not None:
+            mask &= cube.index.get_level_values(KEYS.index(key)).isin(selected)
+    return cube[mask]
+
+
+def filter_correlation(stats, df, filters):
+    """Correlation statistics of the selection; `df` holds the selected rows."""
+    if filters.countries is not None:
+        # Countries are finer than the groups, so the few selected rows are aggregated again
+        return build_correlation_stats(df, stats.columns)
+    mask = group_mask(stats, filters.years, filters.statuses, filters.continents)
+    return CorrelationStats(stats.columns, stats.groups[mask].reset_index(drop=True),
+                            *(array[mask] for array in (stats.n, stats.sx, stats.sxx, stats.sxy)))
+
+
+def sidebar_filters(df):
+    """Country, Continent, Year and Status filters in the sidebar, applied to every chart."""
+    import streamlit as st
+
+    st.sidebar.header('Filters')
+    countries = st.sidebar.multiselect('Country', list(df['Country'].cat.categories), key='filter_countries')
+    continents = st.sidebar.multiselect('Continent', list(df['Continent'].cat.categories), key='filter_continents')
+    years = [int(year) for year in np.unique(df['Year'].to_numpy())]
+    year_range = st.sidebar.select_slider('Years', options=years, value=(years[0], years[-1]), key='filter_years')
+    statuses = st.sidebar.multiselect('Status', list(df['Status'].cat.categories), key='filter_statuses')
+    return Filters(
+        tuple(countries) or None,
+        tuple(continents) or None,
+        None if year_range == (years[0], years[-1]) else tuple(range(year_range[0], year_range[1] + 1)),
+        tuple(statuses) or None,
+    )
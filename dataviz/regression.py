@@ -0,0 +1,76 @@
+"""Least-squares trendlines computed with NumPy.
+
+Plotly Express fits its "ols" trendlines through statsmodels, which is slow to
+import and refits on every call. Here a line is a closed-form fit of the rows
+where both x and y are present. Fits of several groups (e.g. one per continent)
+come from one grouped sum of x, y, x*x, x*y and y*y rather than one fit per
+group.
+"""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from dataviz.profiling import data_prep
+
+
+@data_prep
+def fit_lines(df, x, y, by=None):
+    """Fit y = slope * x + intercept, per group of `by` if given.
+
+    Returns one row per group (a single row without `by`) with slope,
+    intercept, r2, n and the x range of the fitted rows.
+    """
+    xs = df[x].to_numpy(dtype=np.float64)
+    ys = df[y].to_numpy(dtype=np.float64)
+    mask = ~(np.isnan(xs) | np.isnan(ys))
+    xs, ys = xs[mask], ys[mask]
+    terms = pd.DataFrame({'n': 1, 'sx': xs, 'sy': ys, 'sxx': xs * xs, 'sxy': xs * ys, 'syy': ys * ys,
+                          'x_min': xs, 'x_max': xs})
+    sums = ['n', 'sx', 'sy', 'sxx', 'sxy', 'syy']
+    if by is None:
+        stats = terms[sums].sum().to_frame().T
+        stats['x_min'], stats['x_max'] = terms['x_min'].min(), terms['x_max'].max()
+    else:
+        grouped = terms.groupby(df[by].to_numpy()[mask])
+        stats = grouped[sums].sum().join(grouped['x_min'].min()).join(grouped['x_max'].max())
+        stats.index.name = by
+
+    n = stats['n']
+    sxx = n * stats['sxx'] - stats['sx'] ** 2
+    syy = n * stats['syy'] - stats['sy'] ** 2
+    sxy = n * stats['sxy'] - stats['sx'] * stats['sy']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = sxy / sxx
+        r2 = sxy ** 2 / (sxx * syy)
+    fits = pd.DataFrame({
+        'slope': slope,
+        'intercept': (stats['sy'] - slope * stats['sx']) / n,
+        'r2': r2,
+        'n': n.astype(int),
+        'x_min': stats['x_min'],
+        'x_max': stats['x_max'],
+    })
+    # A line needs two distinct x values
+    return fits.where(sxx > 0).assign(n=n.astype(int))
+
+
+@data_prep
+@st.cache_data(max_entries=512, show_spinner=False)
+def cached_fit_lines(key, _df, x, y, by=None):
+    """fit_lines, cached across sessions.
+
+    `key` identifies the rows of `_df` (see dataviz.data.Dataset).
+    """
+    return fit_lines(_df, x, y, by)
+
+
+def trendline(fit, name='OLS trendline', **line):
+    """Line trace of one row of fit_lines, with the equation and R² on hover."""
+    xs = np.array([fit['x_min'], fit['x_max']])
+    return go.Scatter(
+        x=xs, y=fit['slope'] * xs + fit['intercept'],
+        mode='lines', name=name, line=line,
+        hovertemplate=(f"<b>{name}</b><br>y = {fit['slope']:.4g} * x + {fit['intercept']:.4g}"
+                       f"<br>R<sup>2</sup>={fit['r2']:.4f}<br>n={fit['n']}<extra></extra>"),
+    )
@@ -0,0 +1,82 @@
+"""Scatter plots that stay fast on large point clouds.
+
+Below WEBGL_THRESHOLD points, this is a regular SVG px.scatter with hover on
+every country. Above it the points are drawn with WebGL. Above
+DENSITY_THRESHOLD they are binned on the server into a BINS x BINS heatmap,
+whose cells show their count and mean values on hover. Points in sparse cells
+(at most SPARSE_CELL points) are still drawn individually with their hover
+names, so outliers stay identifiable. The payload is then bounded by the grid
+size rather than the row count.
+"""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+WEBGL_THRESHOLD = 5_000
+DENSITY_THRESHOLD = 100_000
+BINS = 100
+SPARSE_CELL = 2
+
+
+def scatter(df, x, y, color=None, hover_name=None, title=None, labels=None,
+            webgl_threshold=WEBGL_THRESHOLD, density_threshold=DENSITY_THRESHOLD):
+    """px.scatter of `df`, switching to WebGL, then to density bins, as it grows."""
+    points = int((df[x].notna() & df[y].notna()).sum())
+    if points > density_threshold:
+        return density_scatter(df, x, y, hover_name=hover_name, title=title, labels=labels)
+    render_mode = 'webgl' if points > webgl_threshold else 'svg'
+    if color and isinstance(df[color].dtype, pd.CategoricalDtype):
+        # plotly express fails on categories without rows, e.g. in a filtered selection
+        columns = list(dict.fromkeys(column for column in (x, y, color, hover_name) if column))
+        df = df[columns].assign(**{color: df[color].cat.remove_unused_categories()})
+    import plotly.express as px
+
+    return px.scatter(df, x=x, y=y, color=color, hover_name=hover_name, title=title, labels=labels,
+                      render_mode=render_mode)
+
+
+def density_scatter(df, x, y, hover_name=None, title=None, labels=None, bins=BINS):
+    """Heatmap of point counts over a bins x bins grid, plus the points of sparse cells."""
+    labels = labels or {}
+    data = df[[x, y] + ([hover_name] if hover_name else [])].dropna(subset=[x, y])
+    xs = data[x].to_numpy(dtype=np.float64)
+    ys = data[y].to_numpy(dtype=np.float64)
+
+    x_edges = np.linspace(xs.min(), xs.max(), bins + 1)
+    y_edges = np.linspace(ys.min(), ys.max(), bins + 1)
+    column = np.clip(np.searchsorted(x_edges, xs, side='right') - 1, 0, bins - 1)
+    row = np.clip(np.searchsorted(y_edges, ys, side='right') - 1, 0, bins - 1)
+    cell = row * bins + column
+    counts = np.bincount(cell, minlength=bins * bins)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_x = np.bincount(cell, weights=xs, minlength=bins * bins) / counts
+        mean_y = np.bincount(cell, weights=ys, minlength=bins * bins) / counts
+
+    shape = (bins, bins)
+    z = np.where(counts > 0, counts, np.nan).reshape(shape)
+    fig = go.Figure(go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=z,
+        customdata=np.dstack([mean_x.reshape(shape), mean_y.reshape(shape)]).round(3),
+        colorscale='Viridis',
+        colorbar=dict(title='Points'),
+        hovertemplate=(f'%{{z}} points<br>mean {labels.get(x, x)}=%{{customdata[0]}}'
+                       f'<br>mean {labels.get(y, y)}=%{{customdata[1]}}<extra></extra>'),
+    ))
+
+    sparse = (counts[cell] <= SPARSE_CELL)
+    if sparse.any():
+        fig.add_trace(go.Scattergl(
+            x=xs[sparse], y=ys[sparse], mode='markers', name='Sparse points',
+            marker=dict(size=4, color='black'),
+            hovertext=data[hover_name].to_numpy()[sparse] if hover_name else None,
+            hovertemplate=(f'<b>%{{hovertext}}</b><br>' if hover_name else '')
+                          + f'{labels.get(x, x)}=%{{x}}<br>{labels.get(y, y)}=%{{y}}<extra></extra>',
+        ))
+    fig.update_layout(
+        title=title, xaxis_title=labels.get(x, x), yaxis_title=labels.get(y, y),
+        # Above the plot, out of the way of the colorbar
+        legend=dict(orientation='h', yanchor='bottom', y=1.0, xanchor='right', x=1.0),
+    )
+    return fig
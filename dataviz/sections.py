@@ -0,0 +1,464 @@
+"""The numbered sections of the dashboard.
+
+Each section has a figure builder and its narrative text. Builders are plain
+functions of the loaded dataset (see dataviz.data.Dataset), so the app only
+calls the builders of the sections a reader has opened. plotly.express is
+imported by the builders that use it, so a page served from the figure cache
+never loads it.
+"""
+from collections import namedtuple
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.subplots as sp
+from plotly.colors import qualitative
+
+from dataviz.animation import animated_bars, animation_controls
+from dataviz.choropleth import build_choropleth
+from dataviz.correlation import correlation_matrix
+from dataviz.cube import indicator_columns, slice_cube
+from dataviz.data import year_rows
+from dataviz.distributions import box_trace, cached_summarize, violin_traces
+from dataviz.regression import cached_fit_lines, trendline
+from dataviz.scatter import scatter
+
+# `header` is set on the first section of each part of the page. `controls`, if
+# set, draws the section's widgets and returns the keyword arguments of `build`.
+Section = namedtuple('Section', ['number', 'header', 'title', 'build', 'comment', 'controls'],
+                     defaults=[None])
+
+AXIS_LABELS = {'Schooling': 'Years of Schooling', 'Life expectancy': 'Life Expectancy'}
+
+
+def year_controls(data, key):
+    """One year at a time by default: only that year's values are sent to the browser."""
+    import streamlit as st
+
+    years = [int(year) for year in sorted(data.df['Year'].unique())]
+    if st.toggle('Animate over the years', key=f'animate_{key}'):
+        return {'year': None}
+    return {'year': st.select_slider('Year', options=years, value=years[-1], key=f'year_{key}')}
+
+
+def summary_controls(value):
+    """Controls of a distribution of `value`: summarized on the server, or every observation sent."""
+    def controls(data, key):
+        import streamlit as st
+
+        if not data.df[value].notna().any():
+            st.info(f'The rows selected in the sidebar have no {value} values.')
+            return None
+        return {'summary': st.toggle('Summarize on the server', value=True, key=f'summary_{key}')}
+    return controls
+
+
+def correlation_filters(data, key):
+    """Year range, statuses and continents the correlations are computed over."""
+    import streamlit as st
+
+    years = [int(year) for year in sorted(data.df['Year'].unique())]
+    year_range = st.select_slider('Years', options=years, value=(years[0], years[-1]), key=f'years_{key}')
+    left, right = st.columns(2)
+    statuses = left.multiselect('Status', sorted(data.df['Status'].dropna().unique()), key=f'statuses_{key}')
+    continents = right.multiselect('Continent', sorted(data.df['Continent'].dropna().unique()), key=f'continents_{key}')
+    return {
+        # None selects everything, including rows without a continent
+        'years': None if year_range == (years[0], years[-1]) else list(range(year_range[0], year_range[1] + 1)),
+        'statuses': statuses or None,
+        'continents': continents or None,
+    }
+
+
+# 2015 has many missing values, so single-year charts stop at the year before
+LAST_COMPLETE_YEAR = 2014
+
+
+def complete_year_controls(data, key):
+    """The last selected year up to LAST_COMPLETE_YEAR, or None (with a notice) without one."""
+    import streamlit as st
+
+    years = np.unique(data.df['Year'].to_numpy())
+    years = years[years <= LAST_COMPLETE_YEAR]
+    if not len(years):
+        st.info(f'The chart needs a year up to {LAST_COMPLETE_YEAR} in the filters of the sidebar.')
+        return None
+    return {'year': int(years[-1])}
+
+
+def pair_controls(data, key):
+    """Any pair of indicators, with its trendline."""
+    import streamlit as st
+
+    indicators = indicator_columns(data.df)
+    left, right = st.columns(2)
+    x = left.selectbox('X axis', indicators, index=indicators.index('Schooling'), key=f'x_{key}')
+    y = right.selectbox('Y axis', indicators, index=indicators.index('Life expectancy'), key=f'y_{key}')
+    return {'x': x, 'y': y}
+
+
+# 1. Average life expectancy and population over the years
+def build_fig1(data):
+    average_life_expectancy_yearly = slice_cube(data.cube, 'Year', ['Life expectancy'])
+    average_population_yearly = slice_cube(data.cube, 'Year', ['Population'])
+
+    fig1 = sp.make_subplots(rows=2, cols=1, subplot_titles=['Average Life Expectancy', 'Average Population'])
+
+    fig1.add_trace(
+        go.Scatter(x=average_life_expectancy_yearly['Year'], y=average_life_expectancy_yearly['Life expectancy'],
+                   mode='lines', name='Life Expectancy'),
+        row=1, col=1
+    )
+
+    fig1.add_trace(
+        go.Scatter(x=average_population_yearly['Year'], y=average_population_yearly['Population'],
+                   mode='lines', name='Population'),
+        row=2, col=1
+    )
+
+    fig1.update_layout(
+        title_text="Average Life Expectancy and Population Over Time",
+        title_font=dict(size=24),
+        legend=dict(font=dict(size=16)),
+        font=dict(size=15),
+        width=1500,
+        height=800,
+        margin=dict(l=20, r=20, t=60, b=20),
+    )
+    return fig1
+
+
+# 2. Life Expectancy over the years of the top 5 and bottom 5 countries
+def build_fig2(data):
+    import plotly.express as px
+
+    average_life_expectancy = slice_cube(data.cube, 'Country', ['Life expectancy']) # calculate the average life expectancy
+    top5_countries = average_life_expectancy.nlargest(5, 'Life expectancy') # take the top 5 average life expectancy
+    bottom5_countries = average_life_expectancy.nsmallest(5, 'Life expectancy') # take the bottom 5 average life expectancy
+
+    # Filtering the Original DataFrame for the Selected Countries
+    selected_countries = top5_countries['Country'].tolist() + bottom5_countries['Country'].tolist()
+    life_expectancy_by_country_year = slice_cube(data.cube, ['Country', 'Year'], ['Life expectancy'])
+    filtered_df = life_expectancy_by_country_year[life_expectancy_by_country_year['Country'].isin(selected_countries)]
+
+    fig2 = px.line(filtered_df, x='Year', y='Life expectancy', color='Country',title='Life Expectancy over the Years for the top 5 and bottom 5 Countries')
+    fig2.update_layout(
+        xaxis_title='Year',
+        yaxis_title='Life Expectancy',
+        title_font=dict(size=24),
+        legend_title='Country',
+        font=dict(size=15),
+        legend=dict(font=dict(size=16)),
+        width=1500,
+        height=800,
+        margin=dict(l=20, r=20, t=60, b=20))
+    return fig2
+
+
+# 3. Violin Plot for Life Expectancy by Continent
+def violin_by_continent(data, value, title, summary):
+    """Violins of `value` per continent, from server-side summaries unless `summary` is off."""
+    if not summary:
+        import plotly.express as px
+
+        return px.violin(data.df, x='Continent', y=value, color='Continent', box=True, title=title)
+    summaries = cached_summarize(data.fingerprint, data.df, value, 'Continent')
+    fig = go.Figure(violin_traces(summaries, qualitative.Plotly))
+    fig.update_layout(
+        title=title,
+        xaxis=dict(tickvals=list(range(len(summaries.stats))), ticktext=list(summaries.stats.index)),
+    )
+    return fig
+
+
+def build_fig3(data, summary=True):
+    fig3 = violin_by_continent(data, 'Life expectancy', 'Violin Plot for Life Expectancy by Continent', summary)
+
+    fig3.update_layout(
+        xaxis_title='Continent',
+        yaxis_title='Life Expectancy',
+        legend_title='Continent',
+        title_font=dict(size=24),
+        font=dict(size=15),
+        width=1500,
+        height=800,
+        margin=dict(l=20, r=20, t=60, b=20),
+    )
+    return fig3
+
+
+# 4. Pie chart for the distribution of countries by Status
+def build_fig4(data):
+    import plotly.express as px
+
+    # Counted here, so the figure carries one value per status instead of one label per row
+    status_counts = data.df['Status'].value_counts(sort=False).rename_axis('Status').reset_index(name='Rows')
+    fig4 = px.pie(
+        status_counts.astype({'Status': object}),
+        names='Status',
+        values='Rows',
+        title='Distribution of Countries by Development Status',
+        color='Status',  # Assigning colors based on the 'Status' column
+        color_discrete_map={'Developing': '#67001F', 'Developed': '#F4A582'},
+        hole=0.4,
+    )
+
+    # Update layout for better readability
+    fig4.update_layout(
+        width=1500,
+        height=800,
+        legend_title_text='Development Status',
+        legend=dict(font=dict(size=16)),
+        title_font=dict(size=24),
+        font=dict(size=15),
+    )
+    return fig4
+
+
+# 5. Comparing the GDP from 2000 to 2015 by the status
+def build_fig5(data):
+    df_gdp_avg = slice_cube(data.cube, ['Year', 'Status'], ['GDP'])
+
+    fig5 = animated_bars(df_gdp_avg, 'Status', 'GDP')
+    fig5.update_layout(
+        title='Average GDP by Country Status over the Years',
+        barmode='group',
+        xaxis_title='Year',
+        yaxis_title='Average GDP (USD)',
+        font=dict(size=15),
+        title_font=dict(size=24),
+        legend=dict(font=dict(size=16)),
+        width=1500,
+        height=800,
+        yaxis=dict( range=[0, 35000]))
+    return fig5
+
+
+# 6. Comparing the life expectancy from 2000 to 2015 by the status
+def build_fig6(data, summary=True):
+    df = data.df
+    title = 'Life Expectancy Distribution by Country Status (2000 to 2015)'
+    if summary:
+        # Quartiles per Year x Status computed here; each frame only carries its year's boxes
+        stats = cached_summarize(data.fingerprint, df, 'Life expectancy', ['Year', 'Status']).stats
+        years = sorted(stats.index.unique(level='Year'))
+        boxes = {year: stats.xs(year, level='Year') for year in years}
+        fig6 = go.Figure(box_trace(boxes[years[0]], list(boxes[years[0]].index), name='Life expectancy',
+                                   marker=dict(color=qualitative.Plotly[0])))
+        fig6.frames = [go.Frame(name=str(year), data=[box_trace(boxes[year], list(boxes[year].index))], traces=[0])
+                       for year in years]
+        sliders, updatemenus = animation_controls(years)
+        fig6.update_layout(title=title, sliders=sliders, updatemenus=updatemenus)
+    else:
+        import plotly.express as px
+
+        fig6 = px.box(df, x='Status', y='Life expectancy',title=title,animation_frame='Year',category_orders={'Year': sorted(df['Year'].unique())},labels={'Life expectancy': 'Life Expectancy', 'Status': 'Development Status'})
+
+    fig6.update_layout(
+        xaxis_title='Development Status',
+        yaxis_title='Life Expectancy',
+        font=dict(size=15),
+        title_font=dict(size=24),
+        legend=dict(font=dict(size=16)),
+        width=1500,
+        height=800,
+        yaxis=dict(range=[35, 90])
+    )
+    return fig6
+
+
+# 7. Correlation map in order to study the columns that are influencing the life expectancy
+def build_fig7(data, years=None, statuses=None, continents=None):
+    import plotly.express as px
+
+    # Merged from the per-group statistics, so a filter does not rescan the rows
+    matrix = correlation_matrix(data.correlation, years, statuses, continents)
+
+    fig7 = px.imshow(
+        matrix,
+        color_continuous_scale='GnBu',
+        labels=dict(x='Features', y='Features', color='Correlation'),
+        title='Correlation Heatmap',
+        width=1500,
+        height=800,
+    )
+    fig7.update_layout(title_font=dict(size=24))
+    return fig7
+
+
+# 8. Correlation between schooling and life expectancy
+def build_fig8(data, x='Schooling', y='Life expectancy'):
+    x_label, y_label = AXIS_LABELS.get(x, x), AXIS_LABELS.get(y, y)
+    if (x, y) == ('Schooling', 'Life expectancy'):
+        title = 'Scatter Plot of Schooling vs Life Expectancy'
+    else:
+        title = f'Scatter Plot of {x} vs {y}'
+    fig8 = scatter(data.df, x=x, y=y, hover_name='Country', title=title, labels={x: x_label, y: y_label})
+
+    # NumPy least squares instead of trendline="ols", which imports statsmodels
+    fit = cached_fit_lines(data.fingerprint, data.df, x, y).iloc[0]
+    if fit.notna().all():
+        fig8.add_trace(trendline(fit, color='red', dash='solid'))
+
+    fig8.update_layout(
+        xaxis_title=x_label,
+        yaxis_title=y_label,
+        width=1500,
+        height=800,
+        font=dict(size=15),
+        title_font=dict(size=24),
+        legend=dict(font=dict(size=16))
+    )
+    return fig8
+
+
+# 9. Correlation between income ressources and life expectancy by continent in 2014
+def build_fig9(data, year=LAST_COMPLETE_YEAR):
+    df_year = year_rows(data.df, year)
+
+    fig9 = scatter(df_year, x='Income composition of resources', y='Life expectancy', color='Continent',hover_name='Country', title=f'Income Composition vs Life Expectancy in {year}',labels={'Income composition of resources': 'Income Composition of Resources', 'Life expectancy': 'Life Expectancy'})
+    fig9.update_traces(marker=dict(size=8), selector=dict(mode='markers'))
+
+    # One trendline per continent, from a single batched fit, in the color of its markers
+    fits = cached_fit_lines((data.fingerprint, 'Year', year), df_year, 'Income composition of resources', 'Life expectancy', by='Continent')
+    markers = {trace.name: trace for trace in fig9.data if trace.type in ('scatter', 'scattergl')}
+    for position, (continent, fit) in enumerate(fits.iterrows()):
+        if fit.isna().any():
+            continue
+        marker_trace = markers.get(continent)
+        color = marker_trace.marker.color if marker_trace else qualitative.Plotly[position % 10]
+        fig9.add_trace(trendline(fit, name=f'{continent} trendline', color=color))
+        fig9.data[-1].update(legendgroup=marker_trace.legendgroup if marker_trace else continent,
+                             showlegend=marker_trace is None)
+
+    fig9.update_layout(
+        xaxis_title='Income Composition of Resources',
+        yaxis_title='Life Expectancy',
+        width=1500,
+        height=800,
+        font=dict(size=15),
+        title_font=dict(size=24),
+    )
+    return fig9
+
+
+# 10. Average BMI by continent
+def build_fig10(data):
+    df_avg_bmi = slice_cube(data.cube, ['Continent', 'Year'], ['BMI'])
+
+    fig10 = animated_bars(df_avg_bmi, 'Continent', 'BMI', labels={'BMI': 'Average BMI', 'Continent': 'Continent'})
+    fig10.update_layout(
+        title='Average BMI by Continent over the Years (2000-2015)',
+        yaxis_range=[df_avg_bmi['BMI'].min(), df_avg_bmi['BMI'].max()],
+        xaxis_title='Continent',
+        yaxis_title='Average BMI',
+        width=1500,
+        height=800,
+        font=dict(size=15),
+        title_font=dict(size=24),
+        legend=dict(font=dict(size=16))
+    )
+    return fig10
+
+
+# 11. Thinness between 1-19 years old accross countries
+def build_fig11(data, year=None):
+    return build_choropleth(data.df, 'Thinness 1-19 years', 'Thinness between 1-19 years old accross countries', year=year)
+
+
+# 12. Violin plot on Alcohol Consumption by continent
+def build_fig12(data, summary=True):
+    fig12 = violin_by_continent(data, 'Alcohol', 'Violin plot on Alcohol Consumption by Continent', summary)
+
+    fig12.update_layout(
+        xaxis_title='Continent',
+        yaxis_title='Alcohol consumtion (in Liters)',
+        legend_title='Continent',
+        legend=dict(font=dict(size=16)),
+        font=dict(size=15),
+        title_font=dict(size=24),
+        width=1500,
+        height=800,
+    )
+    return fig12
+
+
+# 13. Comparision on the evolution of HIV and Measles
+def build_fig13(data):
+    df_hiv_measles = slice_cube(data.cube, 'Year', ['HIV/AIDS', 'Measles'], stat='sum')
+
+    fig13 = sp.make_subplots(rows=2, cols=1, subplot_titles=['HIV/AIDS', 'Measles'])
+
+    bar_trace_hiv = go.Bar(x=df_hiv_measles['Year'], y=df_hiv_measles['HIV/AIDS'], name='HIV/AIDS')
+    bar_trace_measles = go.Bar(x=df_hiv_measles['Year'], y=df_hiv_measles['Measles'], name='Measles')
+
+    fig13.add_trace(bar_trace_hiv, row=2, col=1)
+    fig13.add_trace(bar_trace_measles, row=1, col=1)
+
+    fig13.update_layout(
+        title='Number of Deaths by HIV and Measles (2000-2015)',
+        xaxis_title='Year',
+        yaxis_title='Number of Deaths',
+        width=1500,
+        height=800,
+        font=dict(size=15),
+        title_font=dict(size=24),
+        legend=dict(font=dict(size=16))
+    )
+    fig13.update_xaxes(tickmode='linear')
+    fig13.update_xaxes( title_text='Year', row=2, col=1)
+
+    fig13.update_yaxes( title_text='Number of Deaths')
+    return fig13
+
+
+# 14. Map on the evolution of Adult Mortality
+def build_fig14(data, year=None):
+    return build_choropleth(data.df, 'Adult Mortality', 'Adult Mortality Across Countries', year=year)
+
+
+# 15. Map on the evolution of under five death to compare
+def build_fig15(data, year=None):
+    return build_choropleth(data.df, 'Infant deaths', 'Under five mortality Across Countries', year=year)
+
+
+SECTIONS = [
+    Section(1, 'General Analysis', '1. Average life expectancy and population over the years', build_fig1,
+            'Between 2000 and 2015, we can see that the average life expectancy has increased from 67 to 72 years. For the average population, it is inconsistent over time. In fact, we can observe ups and downs, especially during 2008 and 2010.'),
+    Section(2, None, '2. Life Expectancy over the years of the top 5 and bottom 5 countries', build_fig2,
+            'The top 5 countries having the best average on life expectancy over the years are France, Sweden, Iceland, Japan, and Switzerland. The bottom 5 countries having the worst average on life expectancy over the years are Sierra Leone, Malawi, Angola, Central African Republic, and Lesotho. We can notice that the top 5 countries have an increase in life expectancy (from 81-88), but it stabilises from 2009, whereas for the bottom 5, we can see a considerable growth (from 39 to 51 for certain countries). We can also notice that the top 5 countries belong to the northern hemisphere, unlike the bottom 5 that are African countries.'),
+    Section(3, None, '3. Violin Plot for Life Expectancy by Continent', build_fig3,
+            'We can conclude that Africa is the continent where life expectancy is low, so the authorities should concentrate on this continent. The second continent having a low average is Asia.',
+            controls=summary_controls('Life expectancy')),
+    Section(4, None, '4. Pie chart repesenting the distribution of Countries by Status', build_fig4,
+            'This dataset contains 17.4% of developed countries and 82.6% of developing countries. This is a notable ratio because, typically, developing countries have lower life expectancy so we can study them in detail.'),
+    Section(5, None, '5. Comparing the GDP from 2000 to 2015 by status', build_fig5,
+            'Over the years, there is a significant gap between the GDP of developed countries and developing countries, taking into account the fact that we have only 17% of developed countries. The gap between GDP and status is considerable. In 2000, we have a gap of 12,842 USD to 20,057 in 2014. There is an increase in GDP on both sides, but the increase is greater for developed countries.'),
+    Section(6, None, '6. Comparing the life expectancy from 2000 to 2015 by status', build_fig6,
+            'We notice an evolution in life expectancy on both sides, but values are more scattered in developing countries compared to the concentrated values in developed countries.',
+            controls=summary_controls('Life expectancy')),
+    Section(7, 'Correlation study', '7. Correlation map in order to study the columns that are influencing the life expectancy', build_fig7,
+            "From this correlation matrix, we can see that Schooling, Income composition of resources, and BMI are highly correlated to life expectancy. It means that they influence the growth of life expectancy. Let's concentrate on the analysis of these columns.",
+            controls=correlation_filters),
+    Section(8, None, '8. Correlation between schooling and life expectancy', build_fig8,
+            'We can see that we have a clear correlation line between schooling and life expectancy. The more the years of schooling are, the better life expectancy is.',
+            controls=pair_controls),
+    Section(9, None, '9. Correlation between income ressources and life expectancy by continent in 2014', build_fig9,
+            'Here we are only concentrating on 2014 because 2015 has many missing values, moreover, it enables us to clearly see the correlation. We can note that most countries in Africa have an Income Composition Resources of 0.34-0.59 and a life expectancy of 48-68. For European countries, we have a higher income composition of resources and a better life expectancy. This explains the correlation between both criteria, the more the income composition of resources, the better is the life expectancy.',
+            controls=complete_year_controls),
+    Section(10, 'Health study', '10. Average BMI by continent over the years', build_fig10,
+            'The body mass index (BMI) is a measure that uses your height and weight to work out if your weight is healthy. Compared to the other continents, Africa has the lowest average BMI score. This can explain the fact that it has a lower life expectancy. Indeed, a lower BMI means that they are unhealthy. This can be caused by malnutrition and may provoke earlier death.'),
+    Section(11, None, '11. Thinness between 1-19 years old accross countries', build_fig11,
+            'In order to analyze our hypothesis made in the last visual, we have created this map representing thinness between 1-19 years old across countries. We can see that South Asian countries (like India, Pakistan) have the highest number of thinness between 1-19 years old. Compared to others, African countries also have a relatively high number of thinness between 1-19 years old, but we can also see that this has improved a little over the years. This can be an explanation for the BMI value.',
+            controls=year_controls),
+    Section(12, None, '12. Violin plot on Alcohol Consumption by continent', build_fig12,
+            'Europe is the continent where alcohol consumption is high compared to other continents. We can also see that it is highly spread.',
+            controls=summary_controls('Alcohol')),
+    Section(13, None, '13. Comparision on the evolution of the number of deaths from HIV and Measles', build_fig13,
+            'Healthwise, worldwide for this 2 diseases, we can see there is a significant fall in the number of HIV and measles. This decrease can explain the increase in life expectancy worldwide.'),
+    Section(14, None, '14. Map on the evolution of Adult Mortality', build_fig14,
+            "Over the years, African countries and Asian countries have the highest number of adult deaths. This can be explained by health development, malnutrition, and also geopolitical situations (we don't have more information about this third point).",
+            controls=year_controls),
+    Section(15, None, '15. Map on the evolution of under five death', build_fig15,
+            'Over the years, India and China, which are the most populated countries in the world, have a high number of under-5-year-old deaths. We have already seen that India also had the highest number of thinness between 1-19. These two elements can be correlated.',
+            controls=year_controls),
+]
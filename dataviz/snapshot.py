@@ -0,0 +1,128 @@
+"""Columnar snapshot of the merged and typed dataset.
+
+The snapshot is an uncompressed Arrow IPC file. Uncompressed Arrow can be
+memory-mapped: reading it skips CSV parsing and dtype inference, and the float
+columns become zero-copy, read-only views of the mapped file. Missing
+indicators are stored as NaN values rather than Arrow nulls for that reason.
+
+The file also holds the output of the imputation stage (see
+dataviz/imputation.py): the filled indicators and a 0/1 mask of the imputed
+cells, as prefixed columns. read_snapshot(imputed=True) swaps the filled
+columns in, still without a copy.
+
+Each snapshot is named after the version of its sources and format
+(life_expectancy-<hash>.arrow). A rebuild writes a new file instead of
+replacing one that running sessions still map, which Windows refuses; older
+snapshots are removed once no process maps them.
+
+Build or refresh it with:
+
+    python -m dataviz.snapshot
+"""
+import glob
+import hashlib
+import json
+import os
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from dataviz import DATA_DIR
+
+SNAPSHOT_PREFIX = 'life_expectancy'
+
+VERSION_KEY = b'source_version'
+FORMAT_KEY = b'format_version'
+# Bump when the prepared columns change, so older snapshots are rebuilt
+FORMAT_VERSION = '4'
+
+IMPUTED_PREFIX = 'imputed: '
+MASK_PREFIX = 'imputed mask: '
+
+
+def _to_arrow(df):
+    columns = {}
+    for name, column in df.items():
+        if column.dtype.kind == 'f':
+            # Keep NaN as a value so the column maps without a copy
+            columns[name] = pa.array(column.to_numpy(), from_pandas=False)
+        else:
+            columns[name] = pa.Array.from_pandas(column)
+    return pa.table(columns)
+
+
+def snapshot_path(version, directory=DATA_DIR):
+    """Path of the snapshot of `version`, the (mtime, size) of each source file."""
+    key = json.dumps([FORMAT_VERSION, version])
+    return os.path.join(directory, f'{SNAPSHOT_PREFIX}-{hashlib.sha256(key.encode()).hexdigest()[:16]}.arrow')
+
+
+def remove_stale_snapshots(keep, directory=DATA_DIR):
+    """Delete the snapshots other than `keep`, except those still mapped (on Windows)."""
+    for path in glob.glob(os.path.join(directory, f'{SNAPSHOT_PREFIX}*.arrow')):
+        if os.path.abspath(path) != os.path.abspath(keep):
+            try:
+                os.remove(path)
+            except OSError:
+                pass # mapped by a running process; removed by a later rebuild
+
+
+def write_snapshot(df, version, directory=DATA_DIR, filled=None, mask=None):
+    """Write `df` as the snapshot of `version` and return its path.
+
+    `filled` and `mask`, the output of the imputation stage, are stored with it.
+    """
+    path = snapshot_path(version, directory)
+    table = _to_arrow(df)
+    if filled is not None:
+        for name, column in filled.items():
+            table = table.append_column(IMPUTED_PREFIX + name, pa.array(column.to_numpy(), from_pandas=False))
+        for name, column in mask.items():
+            table = table.append_column(MASK_PREFIX + name, pa.array(column.to_numpy(dtype='uint8')))
+    table = table.replace_schema_metadata({
+        VERSION_KEY: json.dumps(version),
+        FORMAT_KEY: FORMAT_VERSION,
+    })
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with ipc.new_file(tmp_path, table.schema) as writer:
+        writer.write_table(table)
+    # Atomic, so a process reading the snapshot never sees half a file
+    try:
+        os.replace(tmp_path, path)
+    except PermissionError:
+        # Another process built the same version first and maps it (Windows): keep its file
+        os.remove(tmp_path)
+    remove_stale_snapshots(path, directory)
+    return path
+
+
+def read_snapshot(path, imputed=False):
+    """Memory-map the snapshot and return it as a DataFrame, with the imputed values if `imputed`."""
+    table = ipc.open_file(pa.memory_map(path)).read_all()
+    names = [name for name in table.column_names if not name.startswith((IMPUTED_PREFIX, MASK_PREFIX))]
+    if imputed:
+        columns = [table.column(IMPUTED_PREFIX + name if IMPUTED_PREFIX + name in table.column_names else name)
+                   for name in names]
+        table = pa.table(columns, names=names)
+    else:
+        table = table.select(names)
+    return table.to_pandas(split_blocks=True)
+
+
+def read_imputation_mask(path):
+    """Which cells of the snapshot the imputation filled, as a boolean DataFrame."""
+    with pa.memory_map(path) as source:
+        table = ipc.open_file(source).read_all()
+        names = [name for name in table.column_names if name.startswith(MASK_PREFIX)]
+        # astype copies, so the map can be closed
+        mask = table.select(names).to_pandas(split_blocks=True).astype(bool)
+    return mask.rename(columns=lambda name: name[len(MASK_PREFIX):])
+
+
+if __name__ == '__main__':
+    from dataviz.data import build_snapshot, source_version
+
+    df = build_snapshot()
+    path = snapshot_path(source_version())
+    print(f'Wrote {path}: {df.shape[0]} rows, {df.shape[1]} columns, '
+          f'{os.path.getsize(path) / 1024:.0f} KiB')
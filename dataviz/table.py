@@ -0,0 +1,128 @@
+"""Paginated views of the shared frame, sorted, filtered and searched on the server.
+
+Only the rows of the visible page are sent to the browser. The work behind a
+page runs against a TableIndex built once per process:
+
+- sort orders: a stable argsort per column (missing values last), computed the
+  first time the column is sorted on;
+- text search: matched against the categories of the text columns (a few
+  hundred strings) and mapped back to rows through the category codes;
+- column filters: category codes for text columns, and a value range over the
+  column's sort order (two binary searches) for numeric columns.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+class TableIndex:
+    """Sort orders and lookups over a frame that is never modified."""
+
+    def __init__(self, df):
+        self.df = df
+        self._orders = {}
+        self.text_columns = [column for column in df.columns
+                             if isinstance(df[column].dtype, pd.CategoricalDtype)]
+
+    def order(self, column, ascending=True):
+        """Row positions sorted by `column`, missing values last."""
+        if column not in self._orders:
+            values = self.df[column]
+            if column in self.text_columns:
+                # Sort the categories once, then the rows by their category's rank
+                categories = values.cat.categories
+                rank = np.empty(len(categories), dtype=np.int64)
+                rank[np.argsort(categories.astype(str))] = np.arange(len(categories))
+                codes = values.cat.codes.to_numpy()
+                keys = np.where(codes >= 0, rank[codes], len(categories))
+            else:
+                keys = values.to_numpy()
+            self._orders[column] = np.argsort(keys, kind='stable')
+        order = self._orders[column]
+        if ascending:
+            return order
+        # Descending, but still with the missing values last
+        present = self.df[column].notna().to_numpy()[order]
+        return np.concatenate([order[present][::-1], order[~present]])
+
+    def search_mask(self, text):
+        """Rows where any text column contains `text` (case-insensitive)."""
+        mask = np.zeros(len(self.df), dtype=bool)
+        for column in self.text_columns:
+            values = self.df[column]
+            matches = values.cat.categories.astype(str).str.contains(text, case=False, regex=False)
+            if matches.any():
+                mask |= np.isin(values.cat.codes.to_numpy(), np.flatnonzero(matches))
+        return mask
+
+    def filter_mask(self, column, selection):
+        """Rows whose `column` is in `selection`: category values, or a (low, high) range."""
+        values = self.df[column]
+        if column in self.text_columns:
+            codes = values.cat.categories.get_indexer(list(selection))
+            return np.isin(values.cat.codes.to_numpy(), codes[codes >= 0])
+        low, high = selection
+        order = self.order(column)
+        present = int(values.notna().sum()) # the missing values sort last
+        sorted_values = values.to_numpy()[order[:present]]
+        start = np.searchsorted(sorted_values, low, side='left')
+        stop = np.searchsorted(sorted_values, high, side='right')
+        mask = np.zeros(len(self.df), dtype=bool)
+        mask[order[start:stop]] = True
+        return mask
+
+    def query(self, sort_by=None, ascending=True, filters=None, search='', page=0, page_size=PAGE_SIZES[0]):
+        """Return (rows of the page, number of matching rows)."""
+        rows = self.order(sort_by, ascending) if sort_by else np.arange(len(self.df))
+        mask = None
+        for column, selection in (filters or {}).items():
+            column_mask = self.filter_mask(column, selection)
+            mask = column_mask if mask is None else mask & column_mask
+        if search:
+            mask = self.search_mask(search) if mask is None else mask & self.search_mask(search)
+        if mask is not None:
+            rows = rows[mask[rows]]
+        start = page * page_size
+        return self.df.iloc[rows[start:start + page_size]], len(rows)
+
+
+def paginated_table(index, columns, key):
+    """Search box, sort and filter controls, and the current page of `columns`."""
+    import streamlit as st
+
+    df = index.df
+    search_column, sort_column, order_column = st.columns([2, 2, 1])
+    search = search_column.text_input('Search', key=f'search_{key}', placeholder='Country, status, continent...')
+    sort_by = sort_column.selectbox('Sort by', [None] + columns, key=f'sort_{key}',
+                                    format_func=lambda column: 'Dataset order' if column is None else column)
+    ascending = order_column.radio('Order', ['Ascending', 'Descending'], key=f'order_{key}') == 'Ascending'
+
+    filters = {}
+    filter_column = st.selectbox('Filter on', [None] + columns, key=f'filter_{key}',
+                                 format_func=lambda column: 'No filter' if column is None else column)
+    if filter_column in index.text_columns:
+        options = list(df[filter_column].cat.categories)
+        selection = st.multiselect('Values', options, key=f'filter_values_{key}_{filter_column}')
+        if selection:
+            filters[filter_column] = selection
+    elif filter_column is not None:
+        low, high = float(np.nanmin(df[filter_column])), float(np.nanmax(df[filter_column]))
+        selection = st.slider('Range', low, high, (low, high), key=f'filter_range_{key}_{filter_column}')
+        if selection != (low, high):
+            filters[filter_column] = selection
+
+    size_column, page_column, count_column = st.columns([1, 1, 2])
+    page_size = size_column.selectbox('Rows per page', PAGE_SIZES, key=f'page_size_{key}')
+    # The page number is read before the query, so an out-of-range page is clamped after it
+    page = page_column.number_input('Page', min_value=1, value=1, step=1, key=f'page_{key}') - 1
+    rows, total = index.query(sort_by, ascending, filters, search, page, page_size)
+    pages = max(math.ceil(total / page_size), 1)
+    if page >= pages:
+        rows, total = index.query(sort_by, ascending, filters, search, pages - 1, page_size)
+        page = pages - 1
+    first = page * page_size + 1 if total else 0
+    count_column.write(f'Rows {first}-{min(first + page_size - 1, total)} of {total} (page {page + 1} of {pages})')
+    st.dataframe(rows, column_order=columns, use_container_width=True)
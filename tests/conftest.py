@@ -0,0 +1,10 @@
+import pandas as pd
+import pytest
+
+from dataviz.data import COUNTRIES_CSV, LIFE_EXPECTANCY_CSV, prepare
+
+
+@pytest.fixture(scope='session')
+def df():
+    """The prepared frame, built from the shipped CSVs rather than the snapshot."""
+    return prepare(pd.read_csv(LIFE_EXPECTANCY_CSV), pd.read_csv(COUNTRIES_CSV))
@@ -0,0 +1,21 @@
+import numpy as np
+
+from dataviz.correlation import build_correlation_stats, correlation_matrix
+
+
+def test_correlation_matrix_matches_dataframe_corr(df):
+    columns = df.select_dtypes(include='float32').columns
+    stats = build_correlation_stats(df, columns)
+    years, statuses = list(range(2005, 2011)), ['Developing']
+
+    matrix = correlation_matrix(stats, years=years, statuses=statuses)
+    rows = df['Year'].isin(years) & df['Status'].isin(statuses)
+    expected = df.loc[rows, columns].astype(np.float64).corr()
+    np.testing.assert_allclose(matrix.to_numpy(), expected.to_numpy(), atol=1e-10)
+
+
+def test_unfiltered_correlation_matrix_matches_dataframe_corr(df):
+    columns = df.select_dtypes(include='float32').columns
+    matrix = correlation_matrix(build_correlation_stats(df, columns))
+    expected = df[columns].astype(np.float64).corr()
+    np.testing.assert_allclose(matrix.to_numpy(), expected.to_numpy(), atol=1e-10)
@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+
+from dataviz.countries import TableGeocoder, read_geocode_cache, refresh_geocodes, resolve
+
+REFERENCE = pd.DataFrame({
+    'Country': ['Albania', 'France', 'Germany', 'Kenya', 'Peru', 'Timor-Leste'],
+    'Continent': ['Europe', 'Europe', 'Europe', 'Africa', 'South America', None],
+    'latitude': [1.2315264, 46.6, 51.2, 1.4, -9.2, -8.7],
+    'longitude': [-75.8920433, 1.9, 10.4, 38.0, -75.0, 126.1],
+})
+NAMES = list(REFERENCE['Country'])
+
+
+class FailingGeocoder(TableGeocoder):
+
+    def geocode(self, query, **kwargs):
+        location = super().geocode(query, **kwargs)
+        if query == 'Germany':
+            raise TimeoutError('timed out')
+        return location
+
+
+@pytest.fixture
+def geocoder():
+    return FailingGeocoder({
+        'Albania': (1.2315264, -75.8920433), # the village in Colombia
+        'France': (46.6, 1.9),
+        'Peru': (-9.2, -75.0),
+        'Timor-Leste': (-8.7, 126.1),
+    })
+
+
+def test_resolve_fills_continent_and_drops_suspect_coordinates():
+    resolved = resolve(NAMES, REFERENCE, cache={})
+    assert resolved.loc['Timor-Leste', 'Continent'] == 'Asia'
+    assert resolved.loc['Timor-Leste', 'ISO3'] == 'TLS'
+    assert pd.isna(resolved.loc['Albania', 'latitude'])
+    assert resolved.loc['Albania', 'issue'] == 'coordinates outside its continent'
+    assert resolved.loc['France', 'issue'] == ''
+
+
+def test_refresh_caches_plausible_results_and_reports_failures(tmp_path, geocoder):
+    path = tmp_path / 'geocode_cache.json'
+    failures = refresh_geocodes(resolve(NAMES, REFERENCE, cache={}), geocoder, cache_path=path, rate=1000)
+
+    cache = read_geocode_cache(path)
+    assert set(cache) == {'FRA', 'PER', 'TLS'}
+    assert cache['FRA']['query'] == 'France'
+    assert (cache['FRA']['latitude'], cache['FRA']['longitude']) == (46.6, 1.9)
+    assert set(failures) == {'Albania', 'Germany', 'Kenya'}
+    assert 'outside Europe' in failures['Albania']
+    assert failures['Germany'] == 'request failed: timed out'
+    assert failures['Kenya'] == 'not found'
+
+    resolved = resolve(NAMES, REFERENCE, cache)
+    assert resolved.loc['France', 'source'] == 'geocode_cache.json'
+    assert resolved.loc['Kenya', 'source'] == 'countries.csv'
+
+
+def test_refresh_only_queries_missing_entries_unless_forced(tmp_path, geocoder):
+    path = tmp_path / 'geocode_cache.json'
+    resolved = resolve(NAMES, REFERENCE, cache={})
+    refresh_geocodes(resolved, geocoder, cache_path=path, rate=1000)
+    assert sorted(geocoder.queries) == sorted(NAMES)
+
+    geocoder.queries.clear()
+    refresh_geocodes(resolved, geocoder, cache_path=path, rate=1000)
+    assert sorted(geocoder.queries) == ['Albania', 'Germany', 'Kenya']
+
+    geocoder.queries.clear()
+    refresh_geocodes(resolved, geocoder, cache_path=path, rate=1000, force=True)
+    assert sorted(geocoder.queries) == sorted(NAMES)
+    assert set(read_geocode_cache(path)) == {'FRA', 'PER', 'TLS'}
@@ -0,0 +1,21 @@
+import pandas as pd
+
+from dataviz.cube import append_rows, build_cube, slice_cube
+
+
+def test_append_rows_matches_a_full_build(df):
+    cube = append_rows(build_cube(df[df['Year'] < 2015]), df[df['Year'] == 2015])
+    expected = build_cube(df)
+    pd.testing.assert_frame_equal(cube.sort_index(), expected.sort_index(), check_exact=False)
+
+
+def test_slice_cube_matches_groupby(df):
+    measures = ['Life expectancy', 'GDP', 'Population']
+    cube = build_cube(df)
+    for stat in ('mean', 'sum', 'count', 'std'):
+        result = slice_cube(cube, 'Continent', measures, stat=stat).set_index('Continent')
+        expected = getattr(df.astype({measure: 'float64' for measure in measures})
+                           .groupby('Continent', observed=True)[measures], stat)()
+        expected.index = expected.index.astype(object)
+        pd.testing.assert_frame_equal(result, expected, check_exact=False, check_names=False,
+                                      check_dtype=False, rtol=1e-9)
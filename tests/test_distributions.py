@@ -0,0 +1,37 @@
+import numpy as np
+
+from dataviz.distributions import summarize
+
+
+def test_quartiles_and_fences_match_numpy(df):
+    summary = summarize(df, 'Life expectancy', 'Continent')
+    for continent, rows in df.groupby('Continent', observed=True):
+        values = rows['Life expectancy'].dropna().to_numpy(dtype=np.float64)
+        stats = summary.stats.loc[continent]
+        q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+        np.testing.assert_allclose([stats['q1'], stats['median'], stats['q3']], [q1, median, q3])
+        iqr = q3 - q1
+        assert stats['lowerfence'] == values[values >= q1 - 1.5 * iqr].min()
+        assert stats['upperfence'] == values[values <= q3 + 1.5 * iqr].max()
+        assert stats['count'] == len(values)
+
+
+def test_density_matches_an_exact_gaussian_kde(df):
+    summary = summarize(df, 'Alcohol', 'Continent')
+    for position, (continent, rows) in enumerate(df.groupby('Continent', observed=True, sort=False)):
+        values = rows['Alcohol'].dropna().to_numpy(dtype=np.float64)
+        assert summary.stats.index[position] == continent
+        bandwidth = summary.stats['bandwidth'].iloc[position]
+        grid = summary.grid[position]
+        exact = np.exp(-0.5 * ((grid[:, None] - values[None, :]) / bandwidth) ** 2).sum(axis=1)
+        exact /= len(values) * bandwidth * np.sqrt(2 * np.pi)
+        # Linear binning onto the grid is within a percent of the exact sum
+        assert np.abs(summary.density[position] - exact).max() <= 0.01 * exact.max()
+
+
+def test_selection_without_values_gives_an_empty_summary(df):
+    rows = df[df['Country'] == 'Monaco']
+    assert rows['Life expectancy'].isna().all()
+    summary = summarize(rows, 'Life expectancy', ['Year', 'Status'])
+    assert len(summary.stats) == 0
+    assert summary.grid.shape == summary.density.shape == (0, 100)
@@ -0,0 +1,65 @@
+import concurrent.futures
+import os
+
+from dataviz.figure_cache import FigureCache
+
+
+def test_put_then_get_round_trips(tmp_path):
+    cache = FigureCache('dataset', directory=tmp_path)
+    assert cache.get(1, {'year': 2014}) is None
+    cache.put(1, {'year': 2014}, '{"data": []}')
+    assert cache.get(1, {'year': 2014}) == '{"data": []}'
+    assert cache.get(1, {'year': 2013}) is None
+    assert cache.get(2, {'year': 2014}) is None
+
+
+def test_get_or_build_builds_once(tmp_path):
+    cache = FigureCache('dataset', directory=tmp_path)
+    calls = []
+
+    class Figure:
+        def to_json(self):
+            calls.append(1)
+            return '{"data": []}'
+
+    assert cache.get_or_build(1, {}, Figure) == '{"data": []}'
+    assert cache.get_or_build(1, {}, Figure) == '{"data": []}'
+    assert len(calls) == 1
+
+
+def test_least_recently_used_entries_are_evicted_past_the_cap(tmp_path):
+    spec = 'x' * 100
+    cache = FigureCache('dataset', directory=tmp_path, max_bytes=250)
+    cache.put(1, {}, spec)
+    cache.put(2, {}, spec)
+    # Both entries written long ago, then entry 1 read again: entry 2 is the least recently used
+    os.utime(cache._path(1, {}), (0, 0))
+    os.utime(cache._path(2, {}), (1, 1))
+    assert cache.get(1, {}) == spec
+    cache.put(3, {}, spec)
+
+    assert cache.get(2, {}) is None
+    assert cache.get(1, {}) == spec
+    assert cache.get(3, {}) == spec
+
+
+def test_opening_a_cache_purges_entries_of_other_datasets(tmp_path):
+    FigureCache('old dataset', directory=tmp_path).put(1, {}, 'old')
+    cache = FigureCache('new dataset', directory=tmp_path)
+    cache.put(1, {}, 'new')
+
+    assert len(os.listdir(tmp_path)) == 1
+    assert cache.get(1, {}) == 'new'
+
+
+def test_concurrent_puts_of_the_same_entry(tmp_path):
+    cache = FigureCache('dataset', directory=tmp_path)
+    spec = '{"data": []}' * 1000
+
+    def put(_):
+        cache.put(1, {'year': 2014}, spec)
+
+    with concurrent.futures.ThreadPoolExecutor(4) as pool:
+        list(pool.map(put, range(200))) # raises if a put failed
+    assert cache.get(1, {'year': 2014}) == spec
+    assert os.listdir(tmp_path) == [os.path.basename(cache._path(1, {'year': 2014}))]
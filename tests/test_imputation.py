@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from dataviz.imputation import impute
+
+
+def test_impute_matches_per_country_interpolation_then_continent_year_means(df):
+    filled, mask = impute(df)
+    columns = list(filled.columns)
+
+    # Interior gaps: interpolation over the years, country by country
+    values = df[columns].astype(np.float64)
+    expected = pd.DataFrame(index=df.index, columns=columns, dtype=np.float64)
+    for _, rows in df.groupby('Country', observed=True):
+        series = values.loc[rows.index].set_index(rows['Year']).sort_index()
+        interpolated = series.interpolate(method='index', limit_area='inside')
+        expected.loc[rows.sort_values('Year').index] = interpolated.to_numpy()
+    # Other gaps: the observed mean of the continent and year
+    means = values.groupby([df['Continent'], df['Year']], observed=True).transform('mean')
+    expected = expected.fillna(means)
+
+    np.testing.assert_allclose(filled.to_numpy(np.float64), expected.to_numpy(np.float64), rtol=1e-6)
+    pd.testing.assert_frame_equal(mask, df[columns].isna() & expected.notna())
+
+
+def test_impute_keeps_observed_values(df):
+    filled, mask = impute(df)
+    observed = df[filled.columns].notna()
+    assert not (mask & observed).any().any()
+    pd.testing.assert_frame_equal(filled[observed], df[filled.columns][observed])
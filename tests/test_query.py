@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataviz.cube import build_cube, slice_cube
+from dataviz.query import Filters, QueryIndex, filter_cube
+
+CASES = [
+    Filters(countries=('France', 'Kenya', 'Peru', 'Monaco')),
+    Filters(continents=('Europe', 'Africa'), years=tuple(range(2005, 2011))),
+    Filters(continents=('Asia',), statuses=('Developed',)),
+    Filters(countries=('France', 'Japan', 'Kenya'), continents=('Europe', 'Asia'), years=(2000, 2014),
+            statuses=('Developing',)),
+    Filters(years=(2015,), statuses=('Developed', 'Developing')),
+    Filters(countries=('Atlantis',)),
+]
+
+
+def expected_mask(df, filters):
+    mask = np.ones(len(df), dtype=bool)
+    for column, selected in zip(['Country', 'Continent', 'Year', 'Status'], filters):
+        if selected is not None:
+            mask &= df[column].isin(selected).to_numpy()
+    return mask
+
+
+def test_unfiltered_selection_is_every_row(df):
+    assert QueryIndex(df).rows(Filters()) is None
+
+
+@pytest.mark.parametrize('filters', CASES)
+def test_rows_match_isin_masks(df, filters):
+    rows = QueryIndex(df).rows(filters)
+    np.testing.assert_array_equal(rows, np.flatnonzero(expected_mask(df, filters)))
+
+
+@pytest.mark.parametrize('filters', CASES[:5])
+def test_filtered_cube_matches_groupby_of_the_rows(df, filters):
+    measures = ['Life expectancy', 'GDP', 'Alcohol']
+    cube = filter_cube(build_cube(df), filters)
+    result = slice_cube(cube, ['Continent', 'Year'], measures).set_index(['Continent', 'Year'])
+    expected = (df[expected_mask(df, filters)].astype({measure: 'float64' for measure in measures})
+                .groupby(['Continent', 'Year'], observed=True)[measures].mean())
+    expected.index = expected.index.set_levels(expected.index.levels[0].astype(object), level=0)
+    pd.testing.assert_frame_equal(result, expected, check_exact=False, check_dtype=False,
+                                  check_index_type=False, rtol=1e-9)
@@ -0,0 +1,28 @@
+import numpy as np
+
+from dataviz.regression import fit_lines
+
+X, Y = 'Income composition of resources', 'Life expectancy'
+
+
+def polyfit(df):
+    rows = df[[X, Y]].astype(np.float64).dropna()
+    slope, intercept = np.polyfit(rows[X], rows[Y], 1)
+    r2 = np.corrcoef(rows[X], rows[Y])[0, 1] ** 2
+    return slope, intercept, r2, len(rows)
+
+
+def test_fit_lines_matches_polyfit(df):
+    fit = fit_lines(df, X, Y).iloc[0]
+    slope, intercept, r2, n = polyfit(df)
+    np.testing.assert_allclose([fit['slope'], fit['intercept'], fit['r2']], [slope, intercept, r2], rtol=1e-9)
+    assert fit['n'] == n
+
+
+def test_fit_lines_per_group_matches_polyfit(df):
+    fits = fit_lines(df, X, Y, by='Continent')
+    for continent, rows in df.groupby('Continent', observed=True):
+        slope, intercept, r2, n = polyfit(rows)
+        fit = fits.loc[continent]
+        np.testing.assert_allclose([fit['slope'], fit['intercept'], fit['r2']], [slope, intercept, r2], rtol=1e-9)
+        assert fit['n'] == n
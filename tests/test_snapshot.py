@@ -0,0 +1,50 @@
+import os
+
+import pandas as pd
+
+from dataviz import snapshot
+from dataviz.imputation import impute
+
+
+def test_rebuild_writes_a_new_file_next_to_a_mapped_one(tmp_path, df):
+    old_path = snapshot.write_snapshot(df, ((1.0, 10),), tmp_path)
+    old = snapshot.read_snapshot(old_path)
+    new_path = snapshot.write_snapshot(df, ((2.0, 10),), tmp_path)
+
+    assert new_path != old_path
+    assert os.listdir(tmp_path) == [os.path.basename(new_path)]
+    # The frame of the old snapshot stays readable while the process holds it
+    pd.testing.assert_frame_equal(old, snapshot.read_snapshot(new_path))
+
+
+def test_mapped_snapshots_are_kept_where_they_cannot_be_removed(tmp_path, df, monkeypatch):
+    old_path = snapshot.write_snapshot(df, ((1.0, 10),), tmp_path)
+
+    def locked(path):
+        raise PermissionError(f'{path} is mapped by another process')
+
+    monkeypatch.setattr(os, 'remove', locked)
+    new_path = snapshot.write_snapshot(df, ((2.0, 10),), tmp_path)
+    assert sorted(os.listdir(tmp_path)) == sorted(map(os.path.basename, [old_path, new_path]))
+
+
+def test_a_snapshot_built_concurrently_is_kept(tmp_path, df, monkeypatch):
+    path = snapshot.write_snapshot(df, ((1.0, 10),), tmp_path)
+
+    def locked(source, target):
+        raise PermissionError(f'{target} is mapped by another process')
+
+    monkeypatch.setattr(os, 'replace', locked)
+    assert snapshot.write_snapshot(df, ((1.0, 10),), tmp_path) == path
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+
+
+def test_imputed_columns_and_mask_round_trip(tmp_path, df):
+    filled, mask = impute(df)
+    path = snapshot.write_snapshot(df, ((1.0, 10),), tmp_path, filled=filled, mask=mask)
+
+    observed, imputed = snapshot.read_snapshot(path), snapshot.read_snapshot(path, imputed=True)
+    assert list(observed.columns) == list(imputed.columns) == list(df.columns)
+    pd.testing.assert_frame_equal(observed, df, check_categorical=False)
+    pd.testing.assert_frame_equal(imputed[filled.columns], filled)
+    pd.testing.assert_frame_equal(snapshot.read_imputation_mask(path), mask)
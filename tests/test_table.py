@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataviz.table import TableIndex
+
+NUMERIC = ['Life expectancy', 'GDP', 'Alcohol', 'Population', 'Year']
+TEXT = ['Country', 'Status', 'Continent']
+
+
+@pytest.fixture(scope='module')
+def index(df):
+    return TableIndex(df)
+
+
+@pytest.mark.parametrize('column', NUMERIC + TEXT)
+@pytest.mark.parametrize('ascending', [True, False])
+def test_order_matches_sort_values(df, index, column, ascending):
+    values = df[column].astype(object).where(df[column].notna(), None)
+    if column in TEXT:
+        values = values.map(lambda value: value if value is None else str(value))
+    expected = values.sort_values(ascending=ascending, kind='stable', na_position='last')
+    result = values.iloc[index.order(column, ascending)]
+    # Ties may come in another order when descending, so the sorted values are compared
+    assert result.tolist() == expected.tolist()
+    if ascending:
+        np.testing.assert_array_equal(result.index, expected.index)
+
+
+@pytest.mark.parametrize('column, low, high', [
+    ('Life expectancy', 60, 75.5), ('GDP', 0, 1000), ('Alcohol', 0, 4.3), ('Year', 2003, 2009),
+])
+def test_range_filter_matches_boolean_mask(df, index, column, low, high):
+    expected = ((df[column] >= low) & (df[column] <= high)).to_numpy()
+    assert expected.any()
+    np.testing.assert_array_equal(index.filter_mask(column, (low, high)), expected)
+
+
+def test_range_filter_keeps_both_ends(df, index):
+    value = df['Alcohol'].dropna().iloc[100]
+    np.testing.assert_array_equal(index.filter_mask('Alcohol', (value, value)), (df['Alcohol'] == value).to_numpy())
+
+
+@pytest.mark.parametrize('text', ['fra', 'DEVELOPED', 'america', 'an', 'x', "people's", 'CÔTE'])
+def test_search_matches_str_contains(df, index, text):
+    expected = np.zeros(len(df), dtype=bool)
+    for column in TEXT:
+        contains = df[column].astype(object).str.contains(text, case=False, regex=False)
+        expected |= contains.fillna(False).to_numpy(dtype=bool)
+    np.testing.assert_array_equal(index.search_mask(text), expected)
+
+
+def test_query_combines_sort_filters_and_search(df, index):
+    filters = {'Continent': ['Europe', 'Asia'], 'Life expectancy': (70, 80)}
+    rows, total = index.query('GDP', False, filters, 'ia', page=1, page_size=25)
+    mask = (df['Continent'].isin(filters['Continent']) & df['Life expectancy'].between(70, 80)
+            & index.search_mask('ia'))
+    expected = df[mask].sort_values('GDP', ascending=False, kind='stable', na_position='last')
+    assert total == mask.sum()
+    assert rows['GDP'].tolist() == expected['GDP'].iloc[25:50].tolist()